@@ -0,0 +1,207 @@
+"""
+In-process stand-in for the pyodbc module, used by the benchmark suite.
+
+It implements just enough of the DB-API surface used by django_hana_odbc:
+every call is recorded on the owning connection and SELECTs return canned
+rows. A per-call latency can be configured to emulate network round trips.
+
+Install it before the backend is imported:
+
+    import sys
+    from benchmarks import fake_pyodbc
+    sys.modules['pyodbc'] = fake_pyodbc
+"""
+import collections
+import threading
+import time
+
+apilevel = '2.0'
+threadsafety = 1
+paramstyle = 'qmark'
+
+SQL_DOUBLE = 8
+SQL_TYPE_DATE = 91
+SQL_TYPE_TIME = 92
+SQL_TYPE_TIMESTAMP = 93
+
+# Seconds slept on every execute/executemany/fetch call.
+LATENCY = 0.0
+
+# Rows returned by fetch* after a statement; see set_rows().
+ROWS = []
+DESCRIPTION = None
+
+# Only the most recent calls are kept so long runs don't skew memory figures.
+MAX_RECORDED_CALLS = 1000
+
+
+class Error(Exception):
+    pass
+
+
+class Warning(Exception):
+    pass
+
+
+class InterfaceError(Error):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class DataError(DatabaseError):
+    pass
+
+
+class OperationalError(DatabaseError):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class InternalError(DatabaseError):
+    pass
+
+
+class ProgrammingError(DatabaseError):
+    pass
+
+
+class NotSupportedError(DatabaseError):
+    pass
+
+
+def set_rows(rows, description=None):
+    """
+    Set the canned result set returned by every following SELECT.
+    """
+    global ROWS, DESCRIPTION
+    ROWS = list(rows)
+    DESCRIPTION = description
+
+
+def set_latency(seconds):
+    global LATENCY
+    LATENCY = seconds
+
+
+def _wait():
+    if LATENCY:
+        time.sleep(LATENCY)
+
+
+class Cursor(object):
+    arraysize = 1
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.fast_executemany = False
+        self.inputsizes = None
+        self.description = None
+        self.rowcount = -1
+        self._rows = []
+        self._pos = 0
+        self._cancelled = threading.Event()
+        self._executing = False
+
+    def _wait(self):
+        self._cancelled.clear()
+        self._executing = True
+        try:
+            if LATENCY and self._cancelled.wait(LATENCY):
+                raise OperationalError('HY008', 'Operation canceled')
+        finally:
+            self._executing = False
+
+    def cancel(self):
+        # Like SQLCancel(), cancelling a cursor that isn't executing does nothing
+        if self._executing:
+            self._cancelled.set()
+
+    def _record(self, method, sql, params):
+        self.connection.calls.append((method, sql, params))
+
+    def execute(self, sql, *params):
+        if len(params) == 1 and isinstance(params[0], (tuple, list)):
+            params = params[0]
+        self._record('execute', sql, params)
+        self._wait()
+        if sql.lstrip()[:6].lower() == 'select':
+            self._rows = ROWS
+            self.description = DESCRIPTION
+            self.rowcount = len(ROWS)
+        else:
+            self._rows = []
+            self.description = None
+            self.rowcount = 1
+        self._pos = 0
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        self._record('executemany', sql, seq_of_params)
+        self._wait()
+        self._rows = []
+        self.description = None
+        self.rowcount = len(seq_of_params)
+        self._pos = 0
+
+    def setinputsizes(self, sizes):
+        self._record('setinputsizes', None, sizes)
+        self.inputsizes = sizes
+
+    def fetchone(self):
+        if self._pos >= len(self._rows):
+            return None
+        row = self._rows[self._pos]
+        self._pos += 1
+        return row
+
+    def fetchmany(self, size=None):
+        _wait()
+        size = size or self.arraysize
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def fetchall(self):
+        _wait()
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    def close(self):
+        pass
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+
+class Connection(object):
+    def __init__(self, connection_string, autocommit=True):
+        self.connection_string = connection_string
+        self.autocommit = autocommit
+        self.calls = collections.deque(maxlen=MAX_RECORDED_CALLS)
+        self.closed = False
+        self.timeout = 0
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        self.calls.append(('commit', None, None))
+
+    def rollback(self):
+        self.calls.append(('rollback', None, None))
+
+    def close(self):
+        self.closed = True
+
+
+def connect(connection_string, autocommit=True, **kwargs):
+    _wait()
+    return Connection(connection_string, autocommit=autocommit)
@@ -0,0 +1,101 @@
+"""
+Peak memory of materialising a large values()/values_list() result.
+
+Every path runs in its own process against the pyodbc stand-in, which
+holds the canned rows, and reports how far the process's peak RSS grew
+while the rows were materialised on top of that, plus the elapsed time.
+
+Usage, from the repository root:
+
+    python -m benchmarks.memory [--rows N] [PATH ...]
+"""
+from __future__ import print_function
+
+import datetime
+import decimal
+import gc
+import optparse
+import resource
+import subprocess
+import sys
+from timeit import default_timer as timer
+
+FIELDS = ('sensor', 'value', 'active', 'taken_at')
+
+
+def _values_list():
+    from benchmarks.models import Reading
+    return Reading.objects.values_list(*FIELDS)
+
+
+def _values():
+    from benchmarks.models import Reading
+    return Reading.objects.values(*FIELDS)
+
+
+def _iter_values(queryset, **kwargs):
+    from django_hana_odbc.rows import iter_values
+    return iter_values(queryset, **kwargs)
+
+
+def _consume(rows):
+    for row in rows:
+        pass
+
+
+PATHS = [
+    ('values_list()', lambda: list(_values_list())),
+    ('values()', lambda: list(_values())),
+    ('iter_values(values_list())', lambda: list(_iter_values(_values_list()))),
+    ('iter_values(values())', lambda: list(_iter_values(_values()))),
+    ('iter_values(slots=True)', lambda: list(_iter_values(_values_list(), slots=True))),
+    ('iter_values streamed', lambda: _consume(_iter_values(_values_list()))),
+]
+
+
+def peak_rss_kib():
+    # ru_maxrss is in KiB on Linux but in bytes on OS X
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_child(name, number):
+    # Imported for its side effects: it installs the pyodbc stand-in and configures settings
+    import benchmarks.run  # noqa
+    from benchmarks import fake_pyodbc
+    start = datetime.datetime(2013, 1, 1)
+    fake_pyodbc.set_rows(('sensor-%d' % i, decimal.Decimal(i) / 100, i % 2, start + datetime.timedelta(seconds=i))
+                         for i in range(number))
+    func = dict(PATHS)[name]
+    gc.collect()
+    before = peak_rss_kib()
+    started = timer()
+    result = func()
+    elapsed = timer() - started
+    print(peak_rss_kib() - before, elapsed)
+    return result
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage='%prog [options] [path ...]')
+    parser.add_option('--rows', type='int', default=1000000,
+                      help='rows in the result [default: %default]')
+    parser.add_option('--child', help=optparse.SUPPRESS_HELP)
+    options, names = parser.parse_args(argv)
+
+    if options.child:
+        run_child(options.child, options.rows)
+        return
+
+    print('%-32s %16s %10s' % ('path (%d rows)' % options.rows, 'peak RSS +KiB', 'seconds'))
+    for name, func in PATHS:
+        if names and not any(n in name for n in names):
+            continue
+        output = subprocess.check_output([sys.executable, '-m', 'benchmarks.memory',
+                                          '--child', name, '--rows', str(options.rows)])
+        growth, elapsed = output.split()
+        print('%-32s %16d %10.2f' % (name, int(growth), float(elapsed)))
+
+
+if __name__ == '__main__':
+    main()
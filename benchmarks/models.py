@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class Reading(models.Model):
+    sensor = models.CharField(max_length=64)
+    value = models.DecimalField(max_digits=12, decimal_places=4)
+    active = models.BooleanField(default=True)
+    taken_at = models.DateTimeField()
+    note = models.TextField(blank=True)
+
+    class Meta:
+        app_label = 'benchmarks'
@@ -0,0 +1,271 @@
+"""
+Micro-benchmarks for the hot paths of the django_hana_odbc backend.
+
+The database driver is replaced by an in-process pyodbc stand-in
+(benchmarks/fake_pyodbc.py), so the figures measure the backend's own
+overhead rather than HANA or the network.
+
+Usage, from the repository root:
+
+    python -m benchmarks.run [-n NUMBER] [--latency SECONDS] [NAME ...]
+
+Each benchmark reports operations per second, the peak traced memory over
+the run (when tracemalloc is available) and the number of GC-tracked
+objects left behind per operation. The GIS benchmarks need GEOS; point
+GEOS_LIBRARY_PATH at the library if it isn't found automatically.
+"""
+from __future__ import print_function
+
+import datetime
+import decimal
+import gc
+import optparse
+import os
+import sys
+from timeit import default_timer as timer
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from benchmarks import fake_pyodbc
+
+sys.modules['pyodbc'] = fake_pyodbc
+
+from django.conf import settings
+
+if not settings.configured:
+    database = {
+        'ENGINE': 'django_hana_odbc',
+        'NAME': 'bench',
+        'DSN': 'bench',
+        'USER': 'bench',
+        'PASSWORD': 'bench',
+    }
+    gis_database = dict(database, ENGINE='django_hana_odbc.gis')
+    settings.configure(
+        DATABASES={'default': database, 'gis': gis_database},
+        INSTALLED_APPS=['benchmarks'],
+        GEOS_LIBRARY_PATH=os.environ.get('GEOS_LIBRARY_PATH'),
+        USE_TZ=False,
+        DEBUG=False,
+    )
+
+from django.db import connections
+
+BENCHMARKS = []
+
+
+class SkipBenchmark(Exception):
+    pass
+
+
+def benchmark(name):
+    """
+    Register a benchmark. The decorated function receives the default
+    connection and returns the zero-argument callable to be timed.
+    """
+    def decorator(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return decorator
+
+
+def measure(func, number):
+    func()
+    gc.collect()
+
+    start = timer()
+    for i in range(number):
+        func()
+    elapsed = timer() - start
+
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    if tracemalloc is not None:
+        tracemalloc.start()
+    for i in range(number):
+        func()
+    if tracemalloc is not None:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        peak = None
+    gc.collect()
+    objects = len(gc.get_objects()) - objects_before
+
+    return {
+        'ops': number / elapsed if elapsed else float('inf'),
+        'peak': peak,
+        'objects': float(objects) / number,
+    }
+
+
+def _reading(**kwargs):
+    from benchmarks.models import Reading
+    defaults = {
+        'sensor': 'sensor-42',
+        'value': decimal.Decimal('12.3456'),
+        'active': True,
+        'taken_at': datetime.datetime(2013, 5, 1, 12, 30),
+        'note': 'benchmark',
+    }
+    defaults.update(kwargs)
+    return Reading(**defaults)
+
+
+@benchmark('cursor.execute')
+def bench_execute(connection):
+    cursor = connection.cursor()
+    sql = 'SELECT "ID" FROM "BENCHMARKS_READING" WHERE "ID" IN (%s)' % ', '.join(['%s'] * 10)
+    params = tuple(range(10))
+    return lambda: cursor.execute(sql, params)
+
+
+@benchmark('cursor.executemany')
+def bench_executemany(connection):
+    cursor = connection.cursor()
+    sql = 'INSERT INTO "BENCHMARKS_READING" ("SENSOR", "VALUE", "ACTIVE", "TAKEN_AT", "NOTE") VALUES (%s, %s, %s, %s, %s)'
+    param_list = [('sensor-%d' % i, decimal.Decimal(i), True, '2013-05-01 12:30:00', 'note')
+                  for i in range(100)]
+    return lambda: cursor.executemany(sql, param_list)
+
+
+@benchmark('cursor._replace_params')
+def bench_replace_params(connection):
+    cursor = connection.cursor()
+    sql = 'SELECT "ID" FROM "BENCHMARKS_READING" WHERE "ID" IN (%s)' % ', '.join(['%s'] * 100)
+    return lambda: cursor._replace_params(sql, 100)
+
+
+@benchmark('cursor._adapt_params')
+def bench_adapt_params(connection):
+    cursor = connection.cursor()
+    params = tuple(range(20))
+    return lambda: cursor._adapt_params(params)
+
+
+@benchmark('SQLInsertCompiler.as_sql')
+def bench_insert_as_sql(connection):
+    from django.db.models import sql
+    from benchmarks.models import Reading
+    query = sql.InsertQuery(Reading)
+    query.insert_values([f for f in Reading._meta.local_fields if f.name != 'id'],
+                        [_reading()], raw=False)
+    compiler = query.get_compiler(connection=connection)
+    return compiler.as_sql
+
+
+def _select_as_sql(connection, use_cache):
+    from benchmarks.models import Reading
+    query = Reading.objects.filter(sensor='sensor-42', active=True).order_by('-taken_at')[:10].query
+
+    def as_sql():
+        enabled = connection.sql_cache.enabled
+        connection.sql_cache.enabled = use_cache
+        try:
+            return query.get_compiler(connection=connection).as_sql()
+        finally:
+            connection.sql_cache.enabled = enabled
+    return as_sql
+
+
+@benchmark('SQLCompiler.as_sql')
+def bench_select_as_sql(connection):
+    return _select_as_sql(connection, True)
+
+
+@benchmark('SQLCompiler.as_sql (SQL cache off)')
+def bench_select_as_sql_uncached(connection):
+    return _select_as_sql(connection, False)
+
+
+@benchmark('QuerySet.bulk_create (100 rows)')
+def bench_bulk_create(connection):
+    from benchmarks.models import Reading
+    objs = [_reading(sensor='sensor-%d' % i) for i in range(100)]
+    return lambda: Reading.objects.bulk_create(objs)
+
+
+@benchmark('SQLCompiler.resolve_columns')
+def bench_resolve_columns(connection):
+    from benchmarks.models import Reading
+    compiler = Reading.objects.all().query.get_compiler(connection=connection)
+    fields = Reading._meta.fields
+    row = (1, 'sensor-42', decimal.Decimal('12.3456'), 1,
+           datetime.datetime(2013, 5, 1, 12, 30), 'benchmark')
+    return lambda: compiler.resolve_columns(row, fields)
+
+
+@benchmark('QuerySet.dates (1000 buckets)')
+def bench_dates(connection):
+    from benchmarks.models import Reading
+    start = datetime.datetime(2013, 1, 1)
+    rows = [(start + datetime.timedelta(days=i),) for i in range(1000)]
+
+    def dates():
+        fake_pyodbc.set_rows(rows)
+        list(Reading.objects.filter(active=True).dates('taken_at', 'day'))
+    return dates
+
+
+@benchmark('DatabaseWrapper.connect')
+def bench_connect(connection):
+    def connect():
+        connection.connection = None
+        connection.connect()
+    return connect
+
+
+@benchmark('GisOperations.spatial_lookup_sql')
+def bench_spatial_lookup_sql(connection):
+    try:
+        from django.contrib.gis.db import models
+        from django.contrib.gis.geos import Point
+        from django.contrib.gis.measure import D
+        gis_connection = connections['gis']
+        gis_connection.ops
+    except Exception as e:
+        raise SkipBenchmark('GIS backend unavailable: %s' % e)
+    field = models.PointField(srid=4326)
+    field.set_attributes_from_name('location')
+    qn = gis_connection.ops.quote_name
+    value = (Point(23.32, 42.69, srid=4326), D(m=500))
+    lvalue = ('benchmarks_site', 'location', field.db_type(gis_connection))
+    return lambda: gis_connection.ops.spatial_lookup_sql(lvalue, 'distance_lte', value, field, qn)
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage='%prog [options] [benchmark ...]')
+    parser.add_option('-n', '--number', type='int', default=10000,
+                      help='operations per benchmark [default: %default]')
+    parser.add_option('--latency', type='float', default=0.0,
+                      help='seconds the fake driver sleeps per call [default: %default]')
+    options, names = parser.parse_args(argv)
+
+    fake_pyodbc.set_latency(options.latency)
+    fake_pyodbc.set_rows([(1,)])
+    connection = connections['default']
+
+    print('%-36s %14s %14s %12s' % ('benchmark', 'ops/sec', 'peak KiB', 'objects/op'))
+    connection.sql_cache.clear()
+    for name, factory in BENCHMARKS:
+        if names and not any(n in name for n in names):
+            continue
+        try:
+            result = measure(factory(connection), options.number)
+        except SkipBenchmark as e:
+            print('%-36s skipped (%s)' % (name, e))
+            continue
+        if result['peak'] is None:
+            peak = 'n/a'
+        else:
+            peak = '%.1f' % (result['peak'] / 1024.0)
+        print('%-36s %14.1f %14s %12.2f' % (name, result['ops'], peak, result['objects']))
+    stats = connection.sql_cache.stats()
+    print('SQL cache: %d hits, %d misses (%.1f%% hit rate)' % (stats['hits'], stats['misses'], 100 * stats['hit_rate']))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 ### REGISTER
 MODEL_STORE = {}
+CASE_INSENSITIVE_FIELDS = {}
+FULLTEXT_INDEX_FIELDS = {}
 
 ### Model class decorators
 def column_store(klass):
@@ -11,3 +13,21 @@ def row_store(klass):
     """Register model use HANA's column store"""
     MODEL_STORE[klass.__name__] = 'ROW'
     return klass
+
+def case_insensitive(*field_names):
+    """Register model fields for index-usable case insensitive lookups.
+
+    An upper-cased generated column with an index is created next to each
+    field and iexact/icontains/istartswith/iendswith lookups compare against it.
+    """
+    def decorator(klass):
+        CASE_INSENSITIVE_FIELDS[klass.__name__] = set(field_names)
+        return klass
+    return decorator
+
+def fulltext_index(*field_names):
+    """Register model fields to get a HANA fulltext index for the search lookup"""
+    def decorator(klass):
+        FULLTEXT_INDEX_FIELDS[klass.__name__] = set(field_names)
+        return klass
+    return decorator
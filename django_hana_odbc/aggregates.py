@@ -0,0 +1,55 @@
+"""
+Statistical aggregates HANA computes natively, for use with aggregate()
+and annotate() like Django's own:
+
+    from django_hana_odbc.aggregates import Median, Percentile
+
+    Reading.objects.aggregate(Median('value'), p95=Percentile('value', 0.95))
+
+StdDev and Variance work unchanged; the population variants compile to
+STDDEV_POP and VAR_POP.
+"""
+from django.db.models import aggregates
+from django.db.models.sql import aggregates as sql_aggregates
+
+
+class SQLMedian(sql_aggregates.Aggregate):
+    is_computed = True
+    sql_function = 'MEDIAN'
+
+
+class SQLPercentile(sql_aggregates.Aggregate):
+    sql_template = '%(function)s(%(percentile)r) WITHIN GROUP (ORDER BY %(field)s)'
+
+    def __init__(self, col, percentile, discrete=False, **extra):
+        percentile = float(percentile)
+        if not 0 <= percentile <= 1:
+            raise ValueError('Percentile must be between 0 and 1, got %r.' % percentile)
+        super(SQLPercentile, self).__init__(col, percentile=percentile, **extra)
+        # A discrete percentile is one of the values, so it keeps the field's type
+        self.is_computed = not discrete
+        if not discrete:
+            self.field = sql_aggregates.computed_aggregate_field
+        self.sql_function = discrete and 'PERCENTILE_DISC' or 'PERCENTILE_CONT'
+
+
+class Median(aggregates.Aggregate):
+    name = 'Median'
+
+    def add_to_query(self, query, alias, col, source, is_summary):
+        query.aggregates[alias] = SQLMedian(col, source=source, is_summary=is_summary, **self.extra)
+
+
+class Percentile(aggregates.Aggregate):
+    """
+    The `percentile` (0 to 1) of the values, interpolated between the two
+    nearest values (PERCENTILE_CONT) or, with discrete=True, the nearest
+    value itself (PERCENTILE_DISC).
+    """
+    name = 'Percentile'
+
+    def __init__(self, lookup, percentile, discrete=False, **extra):
+        super(Percentile, self).__init__(lookup, percentile=percentile, discrete=discrete, **extra)
+
+    def add_to_query(self, query, alias, col, source, is_summary):
+        query.aggregates[alias] = SQLPercentile(col, source=source, is_summary=is_summary, **self.extra)
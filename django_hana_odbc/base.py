@@ -1,6 +1,7 @@
 """
 SAP HANA ODBC database backend for Django.
 """
+import datetime
 import logging
 import sys
 
@@ -12,6 +13,10 @@ from django_hana_odbc.operations import DatabaseOperations
 from django_hana_odbc.client import DatabaseClient
 from django_hana_odbc.creation import DatabaseCreation
 from django_hana_odbc.introspection import DatabaseIntrospection
+from django_hana_odbc import budget, explain
+from django_hana_odbc.compiler import InListValues
+from django_hana_odbc.timeout import QueryTimeout, statement_timeout
+from django_hana_odbc.sqlcache import SQLCache
 from django.utils.timezone import utc
 from time import time
 
@@ -22,6 +27,26 @@ IntegrityError = Database.IntegrityError
 
 logger = logging.getLogger('django.db.backends')
 
+# Upper bound for the per-connection cache of declared parameter types
+INPUT_SIZES_CACHE_SIZE = 500
+
+
+def _input_size(value):
+    """
+    The (sql_type, size, decimal_digits) a parameter is declared with, for
+    values whose HANA type follows from the Python type. None lets the driver
+    work it out.
+    """
+    if isinstance(value, datetime.datetime):
+        return (Database.SQL_TYPE_TIMESTAMP, 27, 7)
+    if isinstance(value, datetime.date):
+        return (Database.SQL_TYPE_DATE, 10, 0)
+    if isinstance(value, datetime.time):
+        return (Database.SQL_TYPE_TIME, 8, 0)
+    if isinstance(value, float):
+        return (Database.SQL_DOUBLE, 15, 0)
+    return None
+
 class DatabaseFeatures(BaseDatabaseFeatures):
     needs_datetime_string_cast = True
     can_return_id_from_insert = False
@@ -50,6 +75,11 @@ class CursorWrapper(object):
         self.cursor = cursor
         self.db = db
         self.is_hana = True
+        # statements slower than this many seconds get their plan captured
+        self.explain_threshold = db.settings_dict.get('EXPLAIN_SLOW_QUERIES')
+        if db.settings_dict.get('FAST_EXECUTEMANY'):
+            # bind executemany batches as parameter arrays in one round trip
+            cursor.fast_executemany = True
 
     def set_dirty(self):
         if self.db.is_managed():
@@ -67,22 +97,30 @@ class CursorWrapper(object):
 
     def _adapt_params(self, params):
         """
-        Stringify GIS-adapted geometry params to avoid an 'Invalid type' ODBC driver error.
+        Turn GIS-adapted geometry params into values the ODBC driver can bind
+        (see GisOperations.geometry_param), and load the values of large
+        __in lists into their temporary table (see compiler.TemporaryTableIn).
         """
-        def adapted_if_needed(param):
-            if hasattr(self.db.ops, 'Adapter') and isinstance(param, self.db.ops.Adapter):
-                return str(param)
-            else:
-                return param
-        return tuple([adapted_if_needed(p) for p in params])
+        if self.db.in_list_used:
+            params = [p.load(self.db) if isinstance(p, InListValues) else p for p in params]
+        adapter = getattr(self.db.ops, 'Adapter', None)
+        if adapter is None:
+            return tuple(params)
+        ops = self.db.ops
+        return tuple([ops.geometry_param(p) if isinstance(p, adapter) else p for p in params])
 
     def execute(self, sql, params=()):
         """
             execute with replaced placeholders
         """
+        sql = self._replace_params(sql, len(params) if params else 0)
+        params = self._adapt_params(params)
+        tracker = budget.current()
+        timed = tracker is not None or self.explain_threshold is not None
+        if timed:
+            start = time()
         try:
-            self.cursor.execute(self._replace_params(sql, len(params) if params else 0),
-                                self._adapt_params(params))
+            self._call(self.cursor.execute, sql, params)
         except IntegrityError as error:
             raise utils.IntegrityError(str(error))
         except Database.Error as general_error:
@@ -91,11 +129,22 @@ class CursorWrapper(object):
                 raise utils.IntegrityError(message)
             else:
                 raise
+        if timed:
+            duration = time() - start
+            if self.explain_threshold is not None and duration >= self.explain_threshold:
+                explain.capture(self.db, sql, params, duration)
+            if tracker is not None:
+                tracker.record(sql, duration)
 
     def executemany(self, sql, param_list):
+        param_list = [self._adapt_params(item) for item in param_list]
+        sql = self._replace_params(sql, len(param_list[0]) if param_list else 0)
+        input_sizes = self._set_input_sizes(sql, param_list[0]) if param_list else False
+        tracker = budget.current()
+        if tracker is not None:
+            start = time()
         try:
-            self.cursor.executemany(self._replace_params(sql, len(param_list[0]) if param_list and len(param_list) > 0 else 0),
-                                    [self._adapt_params(item) for item in param_list])
+            self._call(self.cursor.executemany, sql, param_list)
         except IntegrityError as error:
             raise utils.IntegrityError(str(error))
         except Database.Error as general_error:
@@ -104,6 +153,39 @@ class CursorWrapper(object):
                 raise utils.IntegrityError(message)
             else:
                 raise
+        finally:
+            if input_sizes:
+                self.cursor.setinputsizes(None)
+        if tracker is not None:
+            tracker.record(sql, time() - start)
+
+    def _call(self, method, sql, params):
+        """
+        Run a cursor method under the connection's statement timeout, if any.
+        """
+        if self.db.query_timeout is None:
+            return method(sql, params)
+        with statement_timeout(self.db, self.cursor, self.db.query_timeout):
+            return method(sql, params)
+
+    def _set_input_sizes(self, sql, params):
+        """
+        Declare the parameter types once per statement shape, so the driver
+        doesn't describe the parameters again for every executemany batch.
+        Returns whether any types were declared.
+        """
+        if not hasattr(self.cursor, 'setinputsizes'):
+            return False
+        shape = (sql, tuple([type(p) for p in params]))
+        sizes = self.db.input_sizes.get(shape)
+        if sizes is None:
+            if len(self.db.input_sizes) >= INPUT_SIZES_CACHE_SIZE:
+                self.db.input_sizes.clear()
+            sizes = self.db.input_sizes[shape] = [_input_size(p) for p in params]
+        if not any(sizes):
+            return False
+        self.cursor.setinputsizes(sizes)
+        return True
 
     def _replace_params(self,sql,params_count):
         """
@@ -182,6 +264,18 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         self.introspection = DatabaseIntrospection(self)
         self.validation = BaseDatabaseValidation(self)
 
+        # declared executemany parameter types, keyed by statement shape
+        self.input_sizes = {}
+        # temporary tables for large __in lists, created per session
+        self.in_list_tables = set()
+        self.in_list_slot = 0
+        # set once a statement with an InListValues parameter has been compiled
+        self.in_list_used = False
+        # seconds after which statements are cancelled, see timeout.query_timeout
+        self.query_timeout = self.settings_dict.get('QUERY_TIMEOUT')
+        # compiled SQL by query shape, see sqlcache
+        self.sql_cache = SQLCache(enabled=self.settings_dict.get('SQL_CACHE', True))
+
     def close(self):
         self.validate_thread_sharing()
         if self.connection is None:
@@ -219,6 +313,7 @@ class DatabaseWrapper(BaseDatabaseWrapper):
 
         # connect with autocommit on unless overridden in settings
         self.connection = Database.connect(connection_string, autocommit=settings.get('AUTOCOMMIT', True))
+        self.in_list_tables = set()
         # uppercase default schema name
         self.default_schema=settings['NAME'].upper()
         self.create_or_set_default_schema()
@@ -0,0 +1,154 @@
+"""
+Query budgets and N+1 detection.
+
+Inside a QueryBudget block every statement run through the backend's
+cursors in the current thread is counted and fingerprinted: literals and
+placeholder lists are normalised, so the queries of an N+1 loop share one
+fingerprint. Leaving the block logs fingerprints seen at least `max_repeats`
+times and any exceeded query count or time budget to the
+django.db.backends.hana.budget logger; with strict=True exceeding a budget
+raises QueryBudgetExceeded right away. This works with DEBUG off.
+
+QueryBudgetMiddleware wraps every request in a budget configured by the
+HANA_QUERY_BUDGET setting, e.g.
+
+    HANA_QUERY_BUDGET = {'MAX_QUERIES': 200, 'MAX_TIME': 2.0, 'MAX_REPEATS': 20, 'STRICT': False}
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import logging
+import re
+import threading
+
+logger = logging.getLogger('django.db.backends.hana.budget')
+
+DEFAULT_MAX_REPEATS = 10
+
+# Upper bound for the cache of statement fingerprints
+FINGERPRINT_CACHE_SIZE = 1000
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_SPACE_RE = re.compile(r'\s+')
+
+_fingerprints = {}
+_local = threading.local()
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """
+    The statement with literals replaced by ?, lists of ? collapsed to (...)
+    and whitespace normalised.
+    """
+    try:
+        return _fingerprints[sql]
+    except KeyError:
+        pass
+    result = _NUMBER_RE.sub('?', _STRING_RE.sub('?', sql))
+    result = _SPACE_RE.sub(' ', _LIST_RE.sub('(...)', result)).strip()
+    if len(_fingerprints) >= FINGERPRINT_CACHE_SIZE:
+        _fingerprints.clear()
+    _fingerprints[sql] = result
+    return result
+
+
+def current():
+    "The innermost active QueryBudget of this thread, or None."
+    return getattr(_local, 'budget', None)
+
+
+class QueryBudget(object):
+    """
+    Count the statements run in a with block, see the module docstring.
+    Nested budgets all see the statements of the inner blocks.
+    """
+    def __init__(self, max_queries=None, max_time=None, max_repeats=DEFAULT_MAX_REPEATS, strict=False,
+                 name=None):
+        self.max_queries = max_queries
+        self.max_time = max_time
+        self.max_repeats = max_repeats
+        self.strict = strict
+        self.name = name
+        self.parent = None
+        self.queries = 0
+        self.time = 0.0
+        self.counts = {}
+
+    def __enter__(self):
+        self.parent = current()
+        _local.budget = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.budget = self.parent
+        if exc_type is None:
+            self.report()
+
+    def record(self, sql, duration):
+        "Account for a statement that took `duration` seconds."
+        budget = self
+        while budget is not None:
+            budget._add(fingerprint(sql), duration)
+            budget = budget.parent
+
+    def _add(self, key, duration):
+        self.queries += 1
+        self.time += duration
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if self.strict and self.exceeded():
+            raise QueryBudgetExceeded('%s: %s' % (self.name or 'Query budget', '; '.join(self.exceeded())))
+
+    def exceeded(self):
+        "Descriptions of the budgets this block has gone over."
+        problems = []
+        if self.max_queries is not None and self.queries > self.max_queries:
+            problems.append('%d queries, budget %d' % (self.queries, self.max_queries))
+        if self.max_time is not None and self.time > self.max_time:
+            problems.append('%.3fs in queries, budget %.3fs' % (self.time, self.max_time))
+        return problems
+
+    def repeated(self):
+        "(fingerprint, count) of the statements run at least max_repeats times, most frequent first."
+        if self.max_repeats is None:
+            return []
+        return sorted([(key, count) for key, count in self.counts.items() if count >= self.max_repeats],
+                      key=lambda item: -item[1])
+
+    def report(self):
+        name = self.name or 'Query budget'
+        for problem in self.exceeded():
+            logger.warning('%s exceeded: %s', name, problem)
+        for key, count in self.repeated():
+            logger.warning('%s: possible N+1, %d times: %s', name, count, key)
+
+
+class QueryBudgetMiddleware(object):
+    """
+    Run every request in a QueryBudget configured by HANA_QUERY_BUDGET.
+    """
+    def __init__(self):
+        from django.conf import settings
+        self.config = getattr(settings, 'HANA_QUERY_BUDGET', {})
+
+    def process_request(self, request):
+        budget = QueryBudget(max_queries=self.config.get('MAX_QUERIES'),
+                             max_time=self.config.get('MAX_TIME'),
+                             max_repeats=self.config.get('MAX_REPEATS', DEFAULT_MAX_REPEATS),
+                             strict=self.config.get('STRICT', False),
+                             name='%s %s' % (request.method, request.path))
+        request.query_budget = budget.__enter__()
+
+    def process_response(self, request, response):
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and current() is budget:
+            budget.__exit__(None, None, None)
+        return response
+
+    def process_exception(self, request, exception):
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and current() is budget:
+            budget.__exit__(type(exception), exception, None)
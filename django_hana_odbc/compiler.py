@@ -1,4 +1,7 @@
+from contextlib import contextmanager
+import copy
 from itertools import izip
+import re
 
 from django.core.exceptions import FieldError
 from django.db import transaction
@@ -11,26 +14,208 @@ from django.db.models.sql.query import get_order_dir, Query
 from django.db.utils import DatabaseError
 from django.db import models
 from django.db.models.sql import compiler
+from django.db.models.sql.where import Constraint, EmptyShortCircuit
+from django.utils import six
+import django_hana_odbc
+from django_hana_odbc.sqlcache import Uncacheable, query_shape, where_params
+
+# Case insensitive lookups and their counterparts on an upper-cased column
+CASE_INSENSITIVE_LOOKUPS = {
+    'iexact': 'exact',
+    'icontains': 'contains',
+    'istartswith': 'startswith',
+    'iendswith': 'endswith',
+}
+
+# __in lookups with more values than this go through a temporary table
+IN_LIST_THRESHOLD = 1000
+
+# Number of value lists a connection keeps in each temporary table
+IN_LIST_SLOTS = 32
+
+
+class TemporaryTableIn(object):
+    """
+    Where node for an __in lookup with a large list of values. It matches
+    the column against a subquery on a local temporary table, so the
+    statement text doesn't depend on the number of values and no statement
+    carries thousands of parameters. The key of the values in the table is
+    an InListValues parameter; the cursor loads the values when the
+    statement is executed, so compiling has no side effects.
+    """
+    def __init__(self, constraint, values):
+        self.constraint = constraint
+        self.values = values
+
+    def relabel_aliases(self, change_map):
+        self.constraint.relabel_aliases(change_map)
+
+    def as_sql(self, qn=None, connection=None):
+        (alias, col, db_type), params = self.constraint.process('in', self.values, connection)
+        connection.in_list_used = True
+        sql = '%s.%s IN (SELECT "V" FROM %s WHERE "K" = %%s)' % (qn(alias), qn(col), in_list_table(connection, db_type))
+        return sql, [InListValues(db_type, params)]
+
+
+class InListValues(object):
+    "Parameter standing for the key of a list of values loaded at execution."
+    def __init__(self, db_type, values):
+        self.db_type = db_type
+        self.values = values
+
+    def __repr__(self):
+        return '<%d values>' % len(self.values)
+
+    def load(self, connection):
+        return load_in_list(connection, self.db_type, self.values)
+
+
+def in_list_table(connection, db_type):
+    return connection.ops.quote_name('#DJANGO_IN_%s' % re.sub(r'\W+', '_', db_type).strip('_'))
+
+
+def load_in_list(connection, db_type, values):
+    """
+    Store `values` in the connection's temporary table for `db_type` under
+    the next of IN_LIST_SLOTS keys and return the key. One table per column
+    type is created on first use in each session.
+    """
+    table = in_list_table(connection, db_type)
+    cursor = connection.cursor()
+    if table not in connection.in_list_tables:
+        cursor.execute('CREATE LOCAL TEMPORARY TABLE %s ("K" int, "V" %s)' % (table, db_type))
+        connection.in_list_tables.add(table)
+    slot = connection.in_list_slot = (connection.in_list_slot + 1) % IN_LIST_SLOTS
+    cursor.execute('DELETE FROM %s WHERE "K" = %%s' % table, [slot])
+    cursor.executemany('INSERT INTO %s VALUES (%%s, %%s)' % table, [(slot, value) for value in values])
+    return slot
+
 
 class SQLCompiler(compiler.SQLCompiler):
+    # (fields, row length, [(column index, field)]) of the columns resolve_columns() converts
+    converted_columns = (None, None, [])
+
+    def as_sql(self, with_limits=True, with_col_aliases=False):
+        with self.rewritten_where():
+            cache = self.connection.sql_cache
+            if (not cache.enabled or type(self) is not SQLCompiler or
+                    (with_limits and self.query.low_mark == self.query.high_mark)):
+                return super(SQLCompiler, self).as_sql(with_limits, with_col_aliases)
+            return self.cached_as_sql(cache, with_limits, with_col_aliases)
+
+    @contextmanager
+    def rewritten_where(self):
+        """
+        Compile with the where tree as rewrite_where() returns it, leaving the
+        query's own tree untouched.
+        """
+        where = self.query.where
+        self.query.where = self.rewrite_where(where)
+        try:
+            yield
+        finally:
+            self.query.where = where
+
+    def rewrite_where(self, node):
+        """
+        `node` with case_insensitive_lookup() and in_list_lookup() applied to
+        its lookups. Nodes with a changed lookup below them are copied, the
+        others are shared with the original tree.
+        """
+        children = []
+        for child in node.children:
+            if isinstance(child, tuple):
+                child = self.in_list_lookup(self.case_insensitive_lookup(child))
+            elif hasattr(child, 'children'):
+                child = self.rewrite_where(child)
+            children.append(child)
+        if all(new is old for new, old in izip(children, node.children)):
+            return node
+        node = copy.copy(node)
+        node.children = children
+        return node
+
+    def cached_as_sql(self, cache, with_limits, with_col_aliases):
+        """
+        Reuse the SQL compiled earlier for a query of the same shape and
+        only collect the parameters, see sqlcache.
+        """
+        self.pre_sql_setup()
+        try:
+            key = query_shape(self.query, with_limits, with_col_aliases)
+        except Uncacheable:
+            return super(SQLCompiler, self).as_sql(with_limits, with_col_aliases)
+        entry = cache.get(key)
+        if entry is not None:
+            try:
+                return entry, tuple(where_params(self.query.where, self.connection))
+            except EmptyShortCircuit:
+                pass
+        sql, params = super(SQLCompiler, self).as_sql(with_limits, with_col_aliases)
+        # Only cache shapes whose parameters all come from the where clause
+        if tuple(where_params(self.query.where, self.connection)) == params:
+            cache.set(key, sql)
+        return sql, params
+
+    def in_list_lookup(self, child):
+        """
+        A TemporaryTableIn node in place of an __in lookup with more values
+        than the IN_LIST_THRESHOLD setting.
+        """
+        threshold = self.connection.settings_dict.get('IN_LIST_THRESHOLD', IN_LIST_THRESHOLD)
+        constraint, lookup_type, value_annotation, value = child
+        if (threshold is not None and lookup_type == 'in' and isinstance(constraint, Constraint) and
+                constraint.field is not None and isinstance(value, (list, tuple)) and len(value) > threshold):
+            return TemporaryTableIn(constraint, value)
+        return child
+
+    def case_insensitive_lookup(self, child):
+        """
+        Point a case insensitive lookup on a field registered with the
+        case_insensitive decorator at its upper-cased generated column,
+        comparing against the upper-cased value instead of UPPER(column),
+        so that HANA can use the column's index.
+        """
+        if not django_hana_odbc.CASE_INSENSITIVE_FIELDS:
+            return child
+        constraint, lookup_type, value_annotation, value = child
+        if (lookup_type in CASE_INSENSITIVE_LOOKUPS and isinstance(constraint, Constraint) and
+                constraint.field is not None and isinstance(value, six.string_types) and
+                constraint.field.name in django_hana_odbc.CASE_INSENSITIVE_FIELDS.get(constraint.field.model.__name__, ())):
+            upper_column = self.connection.ops.upper_column_name(constraint.col)
+            return (Constraint(constraint.alias, upper_column, constraint.field),
+                    CASE_INSENSITIVE_LOOKUPS[lookup_type], value_annotation, value.upper())
+        return child
+
     def resolve_columns(self, row, fields=()):
         """
         Taken from fox:
         https://github.com/django/django/commit/9f6859e1ea
 
         Basically a hook, where we call convert_values() which would turn 0/1 to Booleans.
+        Only the columns of fields convert_values() changes are touched; rows
+        without such columns are passed on as they come from the driver.
+        `fields` can list more columns than the row holds, as for values() of
+        only extra or aggregate columns.
         """
-        values = []
-        index_extra_select = len(self.query.extra_select.keys())
-        for value, field in map(None, row[index_extra_select:], fields):
-            values.append(self.query.convert_values(value, field, connection=self.connection))
-        return row[:index_extra_select] + tuple(values)
+        if self.converted_columns[0] is not fields or self.converted_columns[1] != len(row):
+            index_extra_select = len(self.query.extra_select)
+            converted_types = self.connection.ops.converted_field_types
+            self.converted_columns = (fields, len(row), [
+                (index_extra_select + i, field) for i, field in enumerate(fields)
+                if field is not None and field.get_internal_type() in converted_types
+                and index_extra_select + i < len(row)])
+        columns = self.converted_columns[2]
+        if columns:
+            row = list(row)
+            for i, field in columns:
+                row[i] = self.query.convert_values(row[i], field, connection=self.connection)
+            row = tuple(row)
+        return row
 
 class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
     def as_sql(self):
-        qn = self.connection.ops.quote_name
         opts = self.query.model._meta
-        result = ['INSERT INTO %s' % qn(opts.db_table)]
 
         has_fields = bool(self.query.fields)
         fields = self.query.fields if has_fields else [opts.pk]
@@ -39,12 +224,7 @@ class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
         if opts.pk in fields:
             pkinfields=True;
 
-        if opts.has_auto_field and not pkinfields:
-            # get auto field name
-            auto_field_column=opts.auto_field.db_column or opts.auto_field.column
-            result.append('('+auto_field_column+',%s)' % ', '.join([qn(f.column) for f in fields]))
-        else:
-            result.append('(%s)' % ', '.join([qn(f.column) for f in fields]))
+        head = self.statement_head(fields, pkinfields)
 
         if has_fields:
             params=[]
@@ -69,24 +249,68 @@ class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
             placeholders.append(p)
 
 
+        return [
+            (head + ", ".join(p) + ")", vals)
+            for p, vals in izip(placeholders, params)
+        ]
+
+    def statement_head(self, fields, pkinfields):
+        """
+        The INSERT statement up to its VALUES placeholders, built once per
+        model and field list while the SQL cache is on.
+        """
+        cache = self.connection.sql_cache
+        key = ('insert', self.query.model, tuple(fields), pkinfields)
+        if cache.enabled:
+            head = cache.get(key)
+            if head is not None:
+                return head
+        qn = self.connection.ops.quote_name
+        opts = self.query.model._meta
+        result = ['INSERT INTO %s' % qn(opts.db_table)]
         seq_func=''
-        # don't insert call to seq function if explicit pk field value is provided
         if opts.has_auto_field and not pkinfields:
+            # get auto field name
             auto_field_column=opts.auto_field.db_column or opts.auto_field.column
+            result.append('('+auto_field_column+',%s)' % ', '.join([qn(f.column) for f in fields]))
+            # don't insert call to seq function if explicit pk field value is provided
             seq_func=self.connection.ops.get_seq_name(opts.db_table,auto_field_column)+'.nextval, '
+        else:
+            result.append('(%s)' % ', '.join([qn(f.column) for f in fields]))
+        head = " ".join(result + ["VALUES ("+seq_func])
+        if cache.enabled:
+            cache.set(key, head)
+        return head
 
-
-        return [
-            (" ".join(result + ["VALUES ("+seq_func+"%s)" % ", ".join(p)]), vals)
-            for p, vals in izip(placeholders, params)
-        ]
+    def execute_sql(self, return_id=False):
+        """
+        All rows of a bulk insert share one statement, so they are sent with a
+        single executemany instead of a round trip per row.
+        """
+        assert not (return_id and len(self.query.objs) != 1)
+        self.return_id = return_id
+        statements = self.as_sql()
+        cursor = self.connection.cursor()
+        if len(statements) > 1 and len(set([sql for sql, params in statements])) == 1:
+            cursor.executemany(statements[0][0], [params for sql, params in statements])
+        else:
+            for sql, params in statements:
+                cursor.execute(sql, params)
+        if not (return_id and cursor):
+            return
+        return self.connection.ops.last_insert_id(cursor,
+                self.query.model._meta.db_table, self.query.model._meta.pk.column)
 
 
 class SQLDeleteCompiler(compiler.SQLDeleteCompiler,SQLCompiler):
-    pass
+    def as_sql(self):
+        with self.rewritten_where():
+            return super(SQLDeleteCompiler, self).as_sql()
 
 class SQLUpdateCompiler(compiler.SQLUpdateCompiler,SQLCompiler):
-    pass
+    def as_sql(self):
+        with self.rewritten_where():
+            return super(SQLUpdateCompiler, self).as_sql()
 
 class SQLAggregateCompiler(compiler.SQLAggregateCompiler, SQLCompiler):
     pass
@@ -1,8 +1,13 @@
 import sys
+import threading
 import time
 
+from django.core.management.color import no_style
+from django.core.management.sql import custom_sql_for_model, emit_post_sync_signal
+from django.db import connections, models, router, transaction, utils
 from django.db.backends.creation import BaseDatabaseCreation
 from django.db.backends.util import truncate_name
+from django.utils.six.moves import queue
 import django_hana_odbc
 
 class DatabaseCreation(BaseDatabaseCreation):
@@ -75,6 +80,13 @@ class DatabaseCreation(BaseDatabaseCreation):
                 else:
                     field_output.extend(ref_output)
             table_output.append(' '.join(field_output))
+        for f in self.case_insensitive_fields(model):
+            # Upper-cased copy of the column for index-usable case insensitive lookups
+            table_output.append(' '.join([
+                style.SQL_FIELD(qn(self.connection.ops.upper_column_name(f.column))),
+                style.SQL_COLTYPE(f.db_type(connection=self.connection)),
+                style.SQL_KEYWORD('GENERATED ALWAYS AS'),
+                'UPPER(%s)' % style.SQL_FIELD(qn(f.column))]))
         for field_constraints in opts.unique_together:
             table_output.append(style.SQL_KEYWORD('UNIQUE') + ' (%s)' %
                 ", ".join(
@@ -82,7 +94,7 @@ class DatabaseCreation(BaseDatabaseCreation):
                      for f in field_constraints]))
 
         ### check which column type
-        table_type = django_hana_odbc.MODEL_STORE.get(model.__name__, self.connection.settings_dict.get('DEFAULT_MODEL_STORE', 'COLUMN'))
+        table_type = self.table_type(model)
 
         full_statement = [style.SQL_KEYWORD('CREATE ' + table_type + ' TABLE') + ' ' +
                           style.SQL_TABLE(qn(opts.db_table)) + ' (']
@@ -113,6 +125,104 @@ class DatabaseCreation(BaseDatabaseCreation):
 
 
 
+    def build_schema(self, model_list=None, workers=4, load_data=None, verbosity=1, interactive=False):
+        """
+        Create the tables, sequences and indexes of `model_list` (by default
+        all installed models this database syncs that have no table yet),
+        running independent statements concurrently on `workers` connections.
+
+        Each model's table and sequence are created in order by one worker.
+        Like syncdb, the post_syncdb signal is then sent and the models'
+        custom SQL run. The indexes are only created once every table exists
+        and, if given, `load_data()` has run, so the initial data isn't
+        indexed row by row.
+        """
+        style = no_style()
+        if model_list is None:
+            model_list = [m for m in models.get_models(include_auto_created=True)
+                          if router.allow_syncdb(self.connection.alias, m)]
+        converter = self.connection.introspection.table_name_converter
+        existing = set(self.connection.introspection.table_names())
+        model_list = [m for m in model_list if converter(m._meta.db_table) not in existing]
+
+        # No foreign key constraints are created (see sql_for_inline_foreign_key_references),
+        # so there are no pending references and the tables can be created in any order.
+        tables = [(m, self.sql_create_model(m, style)[0]) for m in model_list]
+        created_models = set(m for m, statements in tables if statements)
+        tables = [statements for m, statements in tables if statements]
+        if verbosity >= 1:
+            print("Creating %d tables on %d connections ..." % (len(tables), workers))
+        self._execute_concurrently(tables, workers)
+
+        emit_post_sync_signal(created_models, verbosity, interactive, self.connection.alias)
+        cursor = self.connection.cursor()
+        for model in model_list:
+            if model in created_models:
+                for sql in custom_sql_for_model(model, style, self.connection):
+                    cursor.execute(sql)
+        transaction.commit_unless_managed(using=self.connection.alias)
+
+        if load_data is not None:
+            load_data()
+
+        indexes = [[sql] for m in model_list for sql in self.sql_indexes_for_model(m, style)]
+        if verbosity >= 1:
+            print("Creating %d indexes on %d connections ..." % (len(indexes), workers))
+        self._execute_concurrently(indexes, workers)
+
+    def _execute_concurrently(self, tasks, workers):
+        """
+        Execute lists of statements on up to `workers` threads, each with its
+        own connection. The statements of one list run in order.
+        """
+        pending = queue.Queue()
+        for statements in tasks:
+            pending.put(statements)
+        errors = []
+        alias = self.connection.alias
+
+        def work():
+            # connections are per thread, so every worker opens its own
+            connection = connections[alias]
+            try:
+                cursor = connection.cursor()
+                while True:
+                    try:
+                        statements = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    for sql in statements:
+                        try:
+                            cursor.execute(sql)
+                        except Exception as e:
+                            errors.append((sql, e))
+                            break
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work) for i in range(min(workers, len(tasks)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            sql, error = errors[0]
+            raise utils.DatabaseError("%d of %d schema statements failed, the first was %s: %s"
+                                      % (len(errors), len(tasks), sql.strip(), error))
+
+    def table_type(self, model):
+        """
+        Return the HANA store (COLUMN or ROW) the model's table is created in.
+        """
+        return django_hana_odbc.MODEL_STORE.get(model.__name__, self.connection.settings_dict.get('DEFAULT_MODEL_STORE', 'COLUMN'))
+
+    def case_insensitive_fields(self, model):
+        """
+        Return the model's fields registered with the case_insensitive decorator.
+        """
+        names = django_hana_odbc.CASE_INSENSITIVE_FIELDS.get(model.__name__, ())
+        return [f for f in model._meta.local_fields if f.name in names]
+
     def sql_for_inline_foreign_key_references(self, field, known_models, style):
         """
         Return the SQL snippet defining the foreign key reference for a field.
@@ -200,28 +310,46 @@ class DatabaseCreation(BaseDatabaseCreation):
         """
         Return the CREATE INDEX SQL statements for a single model field.
         """
-        from django.db.backends.util import truncate_name
-
+        output = []
         if f.db_index and not f.unique:
-            qn = self.connection.ops.quote_name
-            tablespace = f.db_tablespace or model._meta.db_tablespace
-            if tablespace:
-                tablespace_sql = self.connection.ops.tablespace_sql(tablespace)
-                if tablespace_sql:
-                    tablespace_sql = ' ' + tablespace_sql
-            else:
-                tablespace_sql = ''
-            i_name = '%s_%s' % (model._meta.db_table, self._digest(f.column))
-            #HANA complains with semicolon at the end
-            output = [style.SQL_KEYWORD('CREATE INDEX') + ' ' +
-                style.SQL_TABLE(qn(truncate_name(
-                    i_name, self.connection.ops.max_name_length()))) + ' ' +
-                style.SQL_KEYWORD('ON') + ' ' +
-                style.SQL_TABLE(qn(model._meta.db_table)) + ' ' +
-                "(%s)" % style.SQL_FIELD(qn(f.column)) +
-                "%s" % tablespace_sql]
-        else:
-            output = []
+            output.append(self._sql_index_for_column(model, f, f.column, style))
+        if f in self.case_insensitive_fields(model):
+            output.append(self._sql_index_for_column(
+                model, f, self.connection.ops.upper_column_name(f.column), style))
+        if f.name in django_hana_odbc.FULLTEXT_INDEX_FIELDS.get(model.__name__, ()):
+            output.append(self._sql_fulltext_index_for_field(model, f, style))
         return output
 
+    def _sql_fulltext_index_for_field(self, model, f, style):
+        """
+        Fulltext index for the search lookup. ASYNC keeps inserts and updates
+        from waiting on the text analysis.
+        """
+        qn = self.connection.ops.quote_name
+        i_name = '%s_%s_ft' % (model._meta.db_table, self._digest(f.column))
+        return (style.SQL_KEYWORD('CREATE FULLTEXT INDEX') + ' ' +
+            style.SQL_TABLE(qn(truncate_name(
+                i_name, self.connection.ops.max_name_length()))) + ' ' +
+            style.SQL_KEYWORD('ON') + ' ' +
+            style.SQL_TABLE(qn(model._meta.db_table)) + ' ' +
+            "(%s)" % style.SQL_FIELD(qn(f.column)) + ' ' +
+            style.SQL_KEYWORD('ASYNC'))
 
+    def _sql_index_for_column(self, model, f, column, style):
+        qn = self.connection.ops.quote_name
+        tablespace = f.db_tablespace or model._meta.db_tablespace
+        if tablespace:
+            tablespace_sql = self.connection.ops.tablespace_sql(tablespace)
+            if tablespace_sql:
+                tablespace_sql = ' ' + tablespace_sql
+        else:
+            tablespace_sql = ''
+        i_name = '%s_%s' % (model._meta.db_table, self._digest(column))
+        #HANA complains with semicolon at the end
+        return (style.SQL_KEYWORD('CREATE INDEX') + ' ' +
+            style.SQL_TABLE(qn(truncate_name(
+                i_name, self.connection.ops.max_name_length()))) + ' ' +
+            style.SQL_KEYWORD('ON') + ' ' +
+            style.SQL_TABLE(qn(model._meta.db_table)) + ' ' +
+            "(%s)" % style.SQL_FIELD(qn(column)) +
+            "%s" % tablespace_sql)
@@ -0,0 +1,108 @@
+"""
+EXPLAIN PLAN capture.
+
+With 'EXPLAIN_SLOW_QUERIES': <seconds> in the database settings, statements
+that take longer than that are explained with EXPLAIN PLAN and the plan rows
+from EXPLAIN_PLAN_TABLE are logged and kept in `slow_queries` with the
+timing. Capturing is sampled ('EXPLAIN_SAMPLE_RATE', default 1.0) and rate
+limited to one plan per database alias every 'EXPLAIN_INTERVAL' seconds
+(default 60), and the plans are fetched by a background thread on its own
+connection, so the request that ran the slow statement doesn't wait for it.
+
+queryset_explain() returns the plan of a queryset for ad-hoc use.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import deque
+import logging
+import random
+import threading
+import time
+import uuid
+
+from django.db import connections
+from django.utils.six.moves import queue
+
+logger = logging.getLogger('django.db.backends.hana.explain')
+
+PLAN_COLUMNS = ('OPERATOR_ID', 'PARENT_OPERATOR_ID', 'LEVEL', 'OPERATOR_NAME', 'OPERATOR_DETAILS',
+                'EXECUTION_ENGINE', 'SCHEMA_NAME', 'TABLE_NAME', 'TABLE_SIZE', 'OUTPUT_SIZE', 'SUBTREE_COST')
+
+# The most recently explained slow queries, newest last
+slow_queries = deque(maxlen=100)
+
+_queue = queue.Queue(maxsize=100)
+_lock = threading.Lock()
+_last_capture = {}
+_worker = []
+
+
+class SlowQuery(object):
+    __slots__ = ('alias', 'sql', 'params', 'duration', 'timestamp', 'plan')
+
+    def __init__(self, alias, sql, params, duration):
+        self.alias = alias
+        self.sql = sql
+        self.params = params
+        self.duration = duration
+        self.timestamp = time.time()
+        self.plan = None
+
+
+def explain(cursor, sql, params=()):
+    """
+    Run EXPLAIN PLAN for `sql` (with ? placeholders) on a pyodbc cursor and
+    return the plan rows as dicts, removing them from EXPLAIN_PLAN_TABLE.
+    """
+    name = 'django_%s' % uuid.uuid4().hex
+    cursor.execute("EXPLAIN PLAN SET STATEMENT_NAME = '%s' FOR %s" % (name, sql), params)
+    try:
+        cursor.execute('SELECT %s FROM EXPLAIN_PLAN_TABLE WHERE STATEMENT_NAME = ? ORDER BY OPERATOR_ID'
+                       % ', '.join(PLAN_COLUMNS), (name,))
+        return [dict(zip(PLAN_COLUMNS, row)) for row in cursor.fetchall()]
+    finally:
+        cursor.execute('DELETE FROM EXPLAIN_PLAN_TABLE WHERE STATEMENT_NAME = ?', (name,))
+
+
+def queryset_explain(queryset):
+    "The EXPLAIN PLAN rows for a queryset, as returned by explain()."
+    connection = connections[queryset.db]
+    sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    cursor = connection.cursor()
+    return explain(cursor.cursor, cursor._replace_params(sql, len(params)), cursor._adapt_params(params))
+
+
+def capture(connection, sql, params, duration):
+    """
+    Queue a statement that took `duration` seconds for explaining, subject to
+    the connection's sampling and rate limit settings. Called by CursorWrapper.
+    """
+    settings = connection.settings_dict
+    if random.random() >= settings.get('EXPLAIN_SAMPLE_RATE', 1.0):
+        return
+    now = time.time()
+    with _lock:
+        if now - _last_capture.get(connection.alias, 0) < settings.get('EXPLAIN_INTERVAL', 60):
+            return
+        _last_capture[connection.alias] = now
+        if not _worker:
+            worker = threading.Thread(target=_work, name='hana-explain')
+            worker.daemon = True
+            worker.start()
+            _worker.append(worker)
+    try:
+        _queue.put_nowait(SlowQuery(connection.alias, sql, params, duration))
+    except queue.Full:
+        pass
+
+
+def _work():
+    while True:
+        query = _queue.get()
+        try:
+            # connections are per thread, so this is the worker's own connection
+            query.plan = explain(connections[query.alias]._cursor(), query.sql, query.params)
+        except Exception:
+            logger.exception('EXPLAIN PLAN failed for slow query: %s', query.sql)
+        slow_queries.append(query)
+        logger.warning('Slow query (%.3f) %s; args=%s; plan=%s', query.duration, query.sql, query.params, query.plan,
+                       extra={'duration': query.duration, 'sql': query.sql, 'params': query.params, 'plan': query.plan})
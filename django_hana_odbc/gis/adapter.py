@@ -0,0 +1,19 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+
+class WKBAdapter(object):
+    """
+    Adapts GEOS geometries to WKB for HANA, used instead of WKTAdapter
+    when the BINARY_GEOMETRY database setting is on.
+    """
+    def __init__(self, geom):
+        self.wkb = bytearray(geom.wkb)
+        self.srid = geom.srid
+
+    def __eq__(self, other):
+        if not isinstance(other, WKBAdapter):
+            return False
+        return self.wkb == other.wkb and self.srid == other.srid
+
+    def prepare_database_save(self, unused):
+        return self
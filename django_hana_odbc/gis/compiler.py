@@ -1,3 +1,4 @@
+from django.contrib.gis import memoryview
 from django.contrib.gis.db.models.sql.compiler import GeoSQLCompiler as BaseGeoSQLCompiler
 from django_hana_odbc import compiler
 
@@ -6,7 +7,15 @@ SQLCompiler = compiler.SQLCompiler
 
 
 class GeoSQLCompiler(BaseGeoSQLCompiler, SQLCompiler):
-    pass
+    def resolve_columns(self, row, fields=()):
+        """
+        With BINARY_GEOMETRY the driver returns ST_AsBinary() columns as
+        bytearrays. Wrap them in buffers so GEOS can read the WKB; the
+        GeometryProxy on the model only builds the geometry when accessed.
+        """
+        if self.connection.ops.binary_geometry:
+            row = tuple([memoryview(value) if isinstance(value, bytearray) else value for value in row])
+        return super(GeoSQLCompiler, self).resolve_columns(row, fields)
 
 
 class SQLInsertCompiler(compiler.SQLInsertCompiler, GeoSQLCompiler):
@@ -1,6 +1,14 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
+from django.contrib.gis.db.models.fields import GeometryField
 from django_hana_odbc.creation import DatabaseCreation
 
 
 class GisCreation(DatabaseCreation):
-    pass
+    def table_type(self, model):
+        """
+        HANA only supports spatial columns and the spatial engine on column
+        tables, so models with geometry fields always go to the column store.
+        """
+        if any(isinstance(f, GeometryField) for f in model._meta.local_fields):
+            return 'COLUMN'
+        return super(GisCreation, self).table_type(model)
@@ -23,8 +23,8 @@ class SpatialRefSys(models.Model, SpatialRefSysMixin):
 
     @property
     def wkt(self):
-        from django.contrib.gis.gdal import SpatialReference
-        return SpatialReference(self.proj4text).wkt
+        from django_hana_odbc.gis.srs import proj4_to_wkt
+        return proj4_to_wkt(self.proj4text)
 
 
     class Meta:
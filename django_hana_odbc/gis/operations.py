@@ -1,6 +1,7 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 from decimal import Decimal
 from django.contrib.gis.db.backends.adapter import WKTAdapter
+from django_hana_odbc.gis.adapter import WKBAdapter
 from django_hana_odbc.operations import DatabaseOperations
 from django.contrib.gis.db.backends.util import SpatialFunction
 from django.contrib.gis.measure import Distance
@@ -27,15 +28,27 @@ class ST_Distance(GisFunction):
         super(ST_Distance, self).__init__(self.dist_func,
                                           operator=operator)
 
-    def as_sql(self, geo_col, geometry='%s'):
-        srid = 4326
-        # HACK: self.field explicitly set by our ops.spatial_lookup_sql implementation
-        # we need to pass through ST_GeomFromText or HANA won't return any matches
-        # (probably defaulting to SRID 0
-        if hasattr(self, 'field') and hasattr(self.field, 'srid'):
-            srid = self.field.srid
-        return super(ST_Distance, self).as_sql(geo_col, 'ST_GeomFromText({}, {})'.format(geometry, srid))
 
+class ST_WithinDistance(GisFunction):
+    """
+    For distance_lte/dwithin, which HANA can answer from its spatial index
+    instead of computing ST_Distance for every row. ST_WithinDistance includes
+    the boundary, so the strict distance_lt keeps using ST_Distance.
+    """
+    sql_template = '%(geo_col)s.%(function)s(%(geometry)s, %%s) = 1'
+
+    def __init__(self):
+        super(ST_WithinDistance, self).__init__('ST_WithinDistance')
+
+
+class ST_Predicate(GisFunction):
+    "For HANA spatial predicate methods, which return 1 or 0."
+    sql_template = '%(geo_col)s.%(function)s(%(geometry)s) = 1'
+
+
+class ST_EnvelopePredicate(GisFunction):
+    "For spatial predicates on the bounding boxes of both geometries."
+    sql_template = '%(geo_col)s.ST_Envelope().%(function)s(%(geometry)s.ST_Envelope()) = 1'
 
 
 # Valid distance types and substitutions
@@ -43,6 +56,8 @@ dtypes = (Decimal, Distance, float) + six.integer_types
 
 
 def get_dist_ops(operator):
+    if operator == '<=':
+        return (ST_WithinDistance(),)
     return (ST_Distance(operator),)
 
 
@@ -57,6 +72,25 @@ class GisOperations(DatabaseOperations):
     Adapter = WKTAdapter
 
     geometry_functions = {
+        'equals': ST_Predicate('ST_Equals'),
+        'disjoint': ST_Predicate('ST_Disjoint'),
+        'touches': ST_Predicate('ST_Touches'),
+        'crosses': ST_Predicate('ST_Crosses'),
+        'within': ST_Predicate('ST_Within'),
+        'overlaps': ST_Predicate('ST_Overlaps'),
+        'contains': ST_Predicate('ST_Contains'),
+        'covers': ST_Predicate('ST_Covers'),
+        'coveredby': ST_Predicate('ST_CoveredBy'),
+        'intersects': ST_Predicate('ST_Intersects'),
+        # Returns true if B's bounding box completely contains A's bounding box.
+        'contained': ST_EnvelopePredicate('ST_Within'),
+        # Returns true if A's bounding box completely contains B's bounding box.
+        'bbcontains': ST_EnvelopePredicate('ST_Contains'),
+        # Returns true if A's bounding box overlaps B's bounding box.
+        'bboverlaps': ST_EnvelopePredicate('ST_Intersects'),
+        # These are implemented here as synonyms for ST_Equals
+        'same_as': ST_Predicate('ST_Equals'),
+        'exact': ST_Predicate('ST_Equals'),
     }
 
     distance_functions = {
@@ -64,31 +98,63 @@ class GisOperations(DatabaseOperations):
         'distance_gte': (get_dist_ops('>='), dtypes),
         'distance_lt': (get_dist_ops('<'), dtypes),
         'distance_lte': (get_dist_ops('<='), dtypes),
+        'dwithin': (get_dist_ops('<='), dtypes),
     }
     geometry_functions.update(distance_functions)
 
     def __init__(self, connection):
         super(GisOperations, self).__init__(connection)
 
+        # Ship geometries as WKB in both directions instead of WKT text
+        self.binary_geometry = bool(connection.settings_dict.get('BINARY_GEOMETRY', False))
+        if self.binary_geometry:
+            self.select = '%s.ST_AsBinary()'
+            self.Adapter = WKBAdapter
+
         gis_terms = ['isnull']
         gis_terms += list(self.geometry_functions)
         self.gis_terms = dict([(term, None) for term in gis_terms])
 
-    def get_geom_placeholder(self, value, adapter):
+    def get_geom_placeholder(self, f, value):
         """
         Let WKTAdapter just turn this into a nice WKT geometry string that HANA accepts
 
         Note: ST_GeomFromText looks like the better solution since you could pass the SRID too.
         Sadly using that in an UPDATE statement causes the HANA indexserver process to segfault.
+        With BINARY_GEOMETRY the WKB bytes have to go through ST_GeomFromWKB though.
         """
+        if self.binary_geometry:
+            return 'ST_GeomFromWKB(%s, {})'.format(f.srid)
         return '%s'
 
-    def geo_db_type(self, f):
-        geom_type = f.geom_type
-        if geom_type != 'POINT':
-            raise NotImplementedError('Unsupported geometry type: {}'.format(geom_type))
+    def get_geom_lookup_placeholder(self, f):
+        """
+        Placeholder for a geometry used as a lookup argument. It has to go through
+        ST_GeomFrom* with the field's SRID or HANA won't return any matches
+        (probably defaulting to SRID 0).
+        """
+        if self.binary_geometry:
+            return 'ST_GeomFromWKB(%s, {})'.format(f.srid)
+        return 'ST_GeomFromText(%s, {})'.format(f.srid)
+
+    def geometry_param(self, adapter):
+        """
+        Turn an adapted geometry into a value the ODBC driver can bind:
+        WKB as binary, WKT stringified to avoid an 'Invalid type' error.
+        """
+        if self.binary_geometry:
+            return adapter.wkb
+        return str(adapter)
 
-        return 'ST_POINT({})'.format(f.srid)
+    def geo_db_type(self, f):
+        """
+        Points get the dedicated ST_POINT type, every other geometry type
+        (LINESTRING, POLYGON, MULTI*, GEOMETRYCOLLECTION, GEOMETRY) is stored
+        as ST_GEOMETRY.
+        """
+        if f.geom_type == 'POINT':
+            return 'ST_POINT({})'.format(f.srid)
+        return 'ST_GEOMETRY({})'.format(f.srid)
 
     def spatial_ref_sys(self):
         from django_hana_odbc.gis.models import SpatialRefSys
@@ -145,9 +211,6 @@ class GisOperations(DatabaseOperations):
                 if not isinstance(value, (tuple, list)):
                     raise ValueError('Tuple required for `%s` lookup type.' % lookup_type)
 
-                # Geometry is first element of lookup tuple.
-                geom = value[0]
-
                 # Number of valid tuple parameters depends on the lookup type.
                 if len(value) != 2:
                     raise ValueError('Incorrect number of parameters given for `%s` lookup type.' % lookup_type)
@@ -164,10 +227,8 @@ class GisOperations(DatabaseOperations):
                     op = op[0]
             else:
                 op = tmp
-                geom = value
             # Calling the `as_sql` function on the operation instance.
-            op.field = field
-            return op.as_sql(geo_col, self.get_geom_placeholder(field, geom))
+            return op.as_sql(geo_col, self.get_geom_lookup_placeholder(field))
         elif lookup_type == 'isnull':
             # Handling 'isnull' lookup type
             return "%s IS %sNULL" % (geo_col, (not value and 'NOT ' or ''))
@@ -0,0 +1,31 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+from django.contrib.gis.db.models.fields import GeometryField
+from django.db import connections
+
+
+def order_by_distance(queryset, geom, field_name=None, attname='distance'):
+    """
+    Annotate every object with its distance to `geom` as `attname` and order
+    the queryset nearest first.
+
+    GeoQuerySet.distance() builds function-call spatial SQL, which HANA's
+    method syntax (geo_col.ST_Distance(geom)) doesn't fit, so the distance
+    is added through extra() instead. Combine it with a dwithin or
+    distance_lte filter to keep the sort to the candidate rows.
+    """
+    connection = connections[queryset.db]
+    opts = queryset.model._meta
+    if field_name is None:
+        geo_fields = [f for f in opts.fields if isinstance(f, GeometryField)]
+        if not geo_fields:
+            raise TypeError('No geographic field found in model %s.' % opts.object_name)
+        field = geo_fields[0]
+    else:
+        field = opts.get_field(field_name)
+
+    qn = connection.ops.quote_name
+    distance_sql = '%s.%s.ST_Distance(%s)' % (qn(opts.db_table), qn(field.column),
+                                              connection.ops.get_geom_lookup_placeholder(field))
+    return queryset.extra(select={attname: distance_sql},
+                          select_params=[connection.ops.Adapter(field.get_prep_value(geom))],
+                          order_by=[attname])
@@ -0,0 +1,22 @@
+"""
+Spatial reference system helpers.
+
+GeoDjango keeps the units and spheroid of every SRID it has looked up per
+process (django.contrib.gis.db.models.fields.get_srid_info), but building
+them reads SpatialRefSys.wkt several times, and HANA's view only has the
+proj4 definition, which GDAL has to convert each time. The WKT is kept per
+definition for the life of the process.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+_wkt_cache = {}
+
+
+def proj4_to_wkt(proj4text):
+    "WKT for a proj4 definition, converted by GDAL once per process."
+    try:
+        return _wkt_cache[proj4text]
+    except KeyError:
+        from django.contrib.gis.gdal import SpatialReference
+        wkt = _wkt_cache[proj4text] = SpatialReference(proj4text).wkt
+        return wkt
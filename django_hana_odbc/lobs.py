@@ -0,0 +1,94 @@
+"""
+Helpers for HANA LOB (nclob/clob/blob) columns.
+
+With 'DEFER_LOBS': True in the database settings, querysets of models using
+DeferLobsManager defer their LOB fields as if they had been passed to defer(),
+so Django loads each value with its own query on first access. A queryset
+using only() loads exactly the fields it names, LOBs included.
+
+iter_lob() and write_lob() move very large values in chunks, so neither side
+has to hold one huge parameter or result value at once.
+"""
+from django.db import connections
+from django.db.models import Manager
+from django.db.models.query import QuerySet
+
+LOB_TYPES = ('nclob', 'clob', 'blob')
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def is_lob(field, connection):
+    return field.db_type(connection=connection) in LOB_TYPES
+
+
+def lob_field_names(model, connection):
+    return [field.name for field in model._meta.fields if is_lob(field, connection)]
+
+
+class DeferLobsMixin(object):
+    """
+    QuerySet mixin deferring the LOB fields when the queryset's database has
+    DEFER_LOBS set. The fields are added at iteration time rather than with
+    defer() up front, which a later only() naming them would not undo.
+    """
+    def iterator(self):
+        field_names, defer = self.query.deferred_loading
+        connection = connections[self.db]
+        if defer and connection.settings_dict.get('DEFER_LOBS'):
+            lob_names = lob_field_names(self.model, connection)
+            if lob_names:
+                return super(DeferLobsMixin, self.defer(*lob_names)).iterator()
+        return super(DeferLobsMixin, self).iterator()
+
+
+class DeferLobsQuerySet(DeferLobsMixin, QuerySet):
+    pass
+
+
+class DeferLobsManager(Manager):
+    def get_query_set(self):
+        return DeferLobsQuerySet(self.model, using=self._db)
+
+
+def _lob_sql(model, field_name, using):
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    opts = model._meta
+    return connection, qn(opts.db_table), qn(opts.get_field(field_name).column), qn(opts.pk.column)
+
+
+def iter_lob(model, pk, field_name, chunk_size=DEFAULT_CHUNK_SIZE, using='default'):
+    """
+    Yield the value of a LOB field in chunks of `chunk_size` characters (bytes
+    for blobs) using SUBSTRING, instead of materialising it in one fetch.
+    """
+    connection, table, column, pk_column = _lob_sql(model, field_name, using)
+    sql = 'SELECT SUBSTRING(%s, %%s, %%s) FROM %s WHERE %s = %%s' % (column, table, pk_column)
+    cursor = connection.cursor()
+    offset = 1
+    while True:
+        cursor.execute(sql, (offset, chunk_size, pk))
+        row = cursor.fetchone()
+        if row is None or not row[0]:
+            return
+        yield row[0]
+        if len(row[0]) < chunk_size:
+            return
+        offset += chunk_size
+
+
+def write_lob(model, pk, field_name, chunks, using='default'):
+    """
+    Store an iterable of chunks as the value of a LOB field, appending them
+    one UPDATE at a time so no single parameter has to hold the whole value.
+    No chunks store an empty value, or NULL if the field allows it.
+    """
+    connection, table, column, pk_column = _lob_sql(model, field_name, using)
+    cursor = connection.cursor()
+    first = sql = 'UPDATE %s SET %s = %%s WHERE %s = %%s' % (table, column, pk_column)
+    for chunk in chunks:
+        cursor.execute(sql, (chunk, pk))
+        sql = 'UPDATE %s SET %s = %s || %%s WHERE %s = %%s' % (table, column, column, pk_column)
+    if sql is first:
+        cursor.execute(sql, (None if model._meta.get_field(field_name).null else '', pk))
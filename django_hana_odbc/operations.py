@@ -1,8 +1,23 @@
 from __future__ import unicode_literals
 
+import datetime
+import decimal
+
 from django.db.backends import BaseDatabaseOperations
 from django.core.management.color import color_style
 
+# SERIES_ROUND intervals for date_trunc_sql()
+DATE_TRUNC_INTERVALS = {
+    'year': 'INTERVAL 1 YEAR',
+    'quarter': 'INTERVAL 3 MONTH',
+    'month': 'INTERVAL 1 MONTH',
+    'week': 'INTERVAL 7 DAY',
+    'day': 'INTERVAL 1 DAY',
+    'hour': 'INTERVAL 1 HOUR',
+    'minute': 'INTERVAL 1 MINUTE',
+}
+
+
 class DatabaseOperations(BaseDatabaseOperations):
     compiler_module = "django_hana_odbc.compiler"
 
@@ -29,13 +44,18 @@ CREATE SEQUENCE %(seq_name)s RESET BY SELECT IFNULL(MAX(%(column)s),0) + 1 FROM
             return "EXTRACT(%s FROM %s)" % (lookup_type, field_name)
 
     def date_trunc_sql(self, lookup_type, field_name):
-        # very low tech, code should be optimized
-        ltypes = {'year':'YYYY','month':'YYYY-MM','day':'YYYY-MM-DD'}
-        cur_type = ltypes.get(lookup_type)
-        if not cur_type:
-            return field_name
-        sql = "TO_DATE(TO_VARCHAR(%s, '%s'))" % (field_name, cur_type)
-        return sql
+        """
+        Truncate natively with SERIES_ROUND instead of formatting every value
+        as a string and parsing it back. Weeks start on Monday.
+        """
+        try:
+            interval = DATE_TRUNC_INTERVALS[lookup_type]
+        except KeyError:
+            raise ValueError('Unsupported date truncation: %r.' % lookup_type)
+        if lookup_type == 'week':
+            # 1900-01-01 was a Monday
+            return "SERIES_ROUND(%s, '%s', ROUND_DOWN, '1900-01-01')" % (field_name, interval)
+        return "SERIES_ROUND(%s, '%s', ROUND_DOWN)" % (field_name, interval)
 
     def no_limit_value(self):
         return None
@@ -89,17 +109,6 @@ CREATE SEQUENCE %(seq_name)s RESET BY SELECT IFNULL(MAX(%(column)s),0) + 1 FROM
     def prep_for_iexact_query(self, x):
         return x
 
-    def check_aggregate_support(self, aggregate):
-        """Check that the backend supports the provided aggregate
-
-        This is used on specific backends to rule out known aggregates
-        that are known to have faulty implementations. If the named
-        aggregate function has a known problem, the backend should
-        raise NotImplementedError.
-        """
-        if aggregate.sql_function in ('STDDEV_POP', 'VAR_POP'):
-                raise NotImplementedError()
-
     def max_name_length(self):
         """
             Returns the maximum length of table and column names, or None if there
@@ -125,27 +134,77 @@ CREATE SEQUENCE %(seq_name)s RESET BY SELECT IFNULL(MAX(%(column)s),0) + 1 FROM
         """
         Transform a datetime value to an object compatible with what is expected
         by the backend driver for datetime columns.
+
+        The value is bound natively as a timestamp, so HANA doesn't have to parse
+        a string for every row.
         """
         if value is None:
             return None
         if value.tzinfo:
             # HANA doesn't support timezone. If tzinfo is present truncate it.
             # Better set USE_TZ=False in settings.py
-            import datetime
-            return unicode(datetime.datetime(value.year,value.month,value.day,value.hour,\
-                    value.minute,value.second,value.microsecond))
-        return unicode(value)
+            return value.replace(tzinfo=None)
+        return value
+
+    def value_to_db_date(self, value):
+        return value
+
+    def value_to_db_time(self, value):
+        if value is None:
+            return None
+        if value.tzinfo:
+            raise ValueError("SAP HANA backend does not support timezone-aware times.")
+        return value
+
+    def value_to_db_decimal(self, value, max_digits, decimal_places):
+        """
+        Round to the field's scale like the base implementation, but keep the
+        Decimal instead of formatting it to a string.
+        """
+        if value is None:
+            return None
+        context = decimal.getcontext().copy()
+        context.prec = max_digits
+        return value.quantize(decimal.Decimal(1).scaleb(-decimal_places), context=context)
+
+    def year_lookup_bounds(self, value):
+        return [datetime.datetime(value, 1, 1), datetime.datetime(value, 12, 31, 23, 59, 59, 999999)]
+
+    def year_lookup_bounds_for_date_field(self, value):
+        return [datetime.date(value, 1, 1), datetime.date(value, 12, 31)]
+
+    def fulltext_search_sql(self, field_name):
+        """
+        SQL for the search lookup. It is answered from the column's fulltext
+        index (see the fulltext_index decorator) instead of scanning every LOB.
+        FULLTEXT_FUZZY_SCORE in the database settings sets the fuzzy search
+        threshold; set it to None for exact matching.
+        """
+        score = self.connection.settings_dict.get('FULLTEXT_FUZZY_SCORE', 0.8)
+        if score is None:
+            return "CONTAINS(%s, %%s, EXACT)" % field_name
+        return "CONTAINS(%s, %%s, FUZZY(%s))" % (field_name, float(score))
+
+    def upper_column_name(self, column):
+        """
+        Name of the upper-cased generated column kept for fields registered
+        with the case_insensitive decorator.
+        """
+        return column + "_upper"
 
     def lookup_cast(self, lookup_type):
         if lookup_type in ('iexact', 'icontains', 'istartswith', 'iendswith'):
             return "UPPER(%s)"
         return "%s"
 
+    # Field types whose values convert_values() changes
+    converted_field_types = ("BooleanField", "NullBooleanField")
+
     def convert_values(self, value, field):
         """
         Type conversion for boolean field. Keping values as 0/1 confuses
         the modelforms.
         """
-        if (field and field.get_internal_type() in ("BooleanField", "NullBooleanField") and value in (0, 1)):
+        if (field and field.get_internal_type() in self.converted_field_types and value in (0, 1)):
             value = bool(value)
         return value
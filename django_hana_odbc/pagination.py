@@ -0,0 +1,134 @@
+"""
+Keyset (seek) pagination.
+
+Slicing a queryset compiles to LIMIT/OFFSET, so HANA still produces and throws
+away every row before the requested page. keyset_page() instead filters on the
+sort key of the last row of the previous page and only LIMITs, so every page
+costs about the same as the first one when the sort columns are indexed.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from django.core.exceptions import FieldError
+from django.db.models.fields import FieldDoesNotExist
+from django.db.models import Q
+
+
+class KeysetPage(object):
+    """
+    One page of objects. Pass `next_key` as `after` to keyset_page() to get
+    the page that follows; it is None on the last page.
+    """
+    def __init__(self, object_list, next_key):
+        self.object_list = object_list
+        self.next_key = next_key
+
+    @property
+    def has_next(self):
+        return self.next_key is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _resolve_name(opts, name):
+    """
+    `name` with '__pk' appended when it ends at a foreign key: ordering by
+    the relation itself would sort by the related model's Meta.ordering,
+    which the key doesn't hold. The same goes for 'pk' when the primary key
+    is a relation (a parent link or a one-to-one primary key).
+    """
+    prefix = '-' if name.startswith('-') else ''
+    parts = name.lstrip('-').split('__')
+    for i, part in enumerate(parts):
+        if part == 'pk':
+            field = opts.pk
+            if field.rel:
+                parts[i] = field.name
+        else:
+            try:
+                field, model, direct, m2m = opts.get_field_by_name(part)
+            except FieldDoesNotExist:
+                raise FieldError('Cannot resolve keyword %r into field.' % part)
+            if not direct or m2m:
+                raise FieldError('Keyset pagination cannot order by the multi-valued relation %r.' % name)
+        if field.rel:
+            opts = field.rel.to._meta
+    if field.rel:
+        parts.append('pk')
+    return prefix + '__'.join(parts)
+
+
+def _keyset_ordering(queryset, ordering):
+    if ordering is None:
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+    ordering = [name for name in ordering if name != '?']
+    if not ordering and queryset.query.extra_order_by:
+        raise FieldError('Keyset pagination cannot order by extra() columns.')
+    opts = queryset.model._meta
+    ordering = [_resolve_name(opts, name) for name in ordering]
+    pk_names = set([_resolve_name(opts, 'pk'), _resolve_name(opts, opts.pk.name)])
+    # The pk breaks ties so that no row is skipped or repeated between pages
+    if not [name for name in ordering if name.lstrip('-') in pk_names]:
+        ordering.append(_resolve_name(opts, 'pk'))
+    return ordering
+
+
+def _key_value(obj, name):
+    parts = name.lstrip('-').split('__')
+    for i, attname in enumerate(parts):
+        if parts[i + 1:] == ['pk']:
+            # Read the foreign key column rather than loading the related object
+            field = obj._meta.get_field_by_name(attname)[0]
+            if field.rel.get_related_field().primary_key:
+                return getattr(obj, field.attname)
+        obj = getattr(obj, attname)
+    return obj
+
+
+def keyset_filter(ordering, after, reverse=False):
+    """
+    A Q object matching the rows that sort after the key `after` in
+    `ordering`, expanded as a >= x AND ((a > x) OR (a = x AND b > y) OR ...);
+    the redundant leading a >= x lets HANA range scan an index on a. With
+    reverse=True, as for a reversed queryset, every direction is flipped.
+    """
+    if len(ordering) != len(after):
+        raise ValueError('The key has %d values but the ordering has %d fields.' % (len(after), len(ordering)))
+    condition = Q()
+    equal = {}
+    for name, value in zip(ordering, after):
+        field = name.lstrip('-')
+        descending = name.startswith('-') != reverse
+        lookup = '%s__%s' % (field, 'lt' if descending else 'gt')
+        condition |= Q(**dict(equal, **{lookup: value}))
+        equal[field] = value
+    if len(ordering) > 1:
+        name = ordering[0]
+        descending = name.startswith('-') != reverse
+        condition = Q(**{'%s__%s' % (name.lstrip('-'), 'lte' if descending else 'gte'): after[0]}) & condition
+    return condition
+
+
+def keyset_page(queryset, after=None, per_page=25, ordering=None):
+    """
+    Return the KeysetPage of `per_page` objects following the key `after`,
+    or the first page if `after` is None.
+
+    The queryset's ordering (or `ordering`) is used with the pk appended as a
+    tie-breaker, and reverse() is honoured. A foreign key in the ordering
+    sorts by the related pk. The sort fields must not be NULL, as NULLs never
+    compare greater or less than the key.
+    """
+    ordering = _keyset_ordering(queryset, ordering)
+    queryset = queryset.order_by(*ordering)
+    if after is not None:
+        queryset = queryset.filter(keyset_filter(ordering, after, not queryset.query.standard_ordering))
+    # One row more than needed tells whether there is a next page
+    object_list = list(queryset[:per_page + 1])
+    next_key = None
+    if len(object_list) > per_page:
+        object_list = object_list[:per_page]
+        next_key = tuple(_key_value(object_list[-1], name) for name in ordering)
+    return KeysetPage(object_list, next_key)
@@ -0,0 +1,92 @@
+"""
+Lean iteration over values() and values_list() querysets.
+
+iter_values() streams the rows of a values/values_list queryset straight
+from fetchmany() chunks of the cursor without filling the queryset's result
+cache, building each final row once: a tuple (or the single value with
+flat=True) for values_list(), a dict for values(), or with slots=True an
+instance of a small class with __slots__ named after the fields, which
+takes less memory than a dict and allows attribute access.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from django.db.models.query import ValuesListQuerySet, ValuesQuerySet
+
+# Rows fetched from the cursor at a time
+DEFAULT_CHUNK_SIZE = 2000
+
+_row_classes = {}
+
+
+class SlotsRow(object):
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __iter__(self):
+        for name in self.__slots__:
+            yield getattr(self, name)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__,
+                           ', '.join('%s=%r' % (name, getattr(self, name)) for name in self.__slots__))
+
+
+def row_class(names):
+    "The SlotsRow subclass for the field names `names`, created once per name list."
+    names = tuple(names)
+    try:
+        return _row_classes[names]
+    except KeyError:
+        cls = _row_classes[names] = type(str('Row'), (SlotsRow,), {'__slots__': tuple(str(n) for n in names)})
+        return cls
+
+
+def iter_values(queryset, slots=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield the rows of a values() or values_list() queryset as described in
+    the module docstring. Querysets with extra() selects or annotations are
+    iterated the regular way.
+    """
+    if not isinstance(queryset, ValuesQuerySet):
+        raise TypeError('iter_values() needs a values() or values_list() queryset.')
+    query = queryset.query
+    if query.extra_select or query.aggregate_select:
+        for row in queryset.iterator():
+            yield row
+        return
+
+    names = queryset.field_names
+    compiler = query.get_compiler(queryset.db)
+    cursor = compiler.execute_sql(None)
+    if not cursor:
+        return
+    fields = query.select_fields + query.related_select_fields
+    if slots:
+        make_row = row_class(names)
+    elif isinstance(queryset, ValuesListQuerySet):
+        if queryset.flat and len(names) == 1:
+            make_row = lambda *values: values[0]
+        else:
+            make_row = lambda *values: values
+    else:
+        make_row = lambda *values: dict(zip(names, values))
+
+    resolve_columns = compiler.resolve_columns
+    # distinct() selects the order_by() columns too, after the values
+    trim = len(query.ordering_aliases)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        for row in rows:
+            if trim:
+                row = row[:-trim]
+            yield make_row(*resolve_columns(row, fields))
@@ -0,0 +1,118 @@
+"""
+Cache of compiled SQL.
+
+Compiling the same queryset shape again (same model, joins, selected and
+deferred columns, ordering, slicing and filter lookups, but different filter
+values) produces the same SQL text. SQLCompiler looks the text up by
+query_shape() and only collects the parameters with where_params(); an
+insert reuses the statement up to its VALUES placeholders. Queries using
+extra(), aggregates, select_related(), distinct() or expressions are always
+compiled normally.
+
+Each connection has its own cache, `connection.sql_cache`; set 'SQL_CACHE':
+False in the database settings to turn it off. stats() reports the hit rate.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from django.db.models.sql.where import Constraint, WhereNode
+
+# Upper bound for the number of statements cached per connection
+SQL_CACHE_SIZE = 500
+
+
+class Uncacheable(Exception):
+    pass
+
+
+class SQLCache(object):
+    def __init__(self, enabled=True, size=SQL_CACHE_SIZE):
+        self.enabled = enabled
+        self.size = size
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        try:
+            entry = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def set(self, key, entry):
+        if len(self.entries) >= self.size:
+            self.entries.clear()
+        self.entries[key] = entry
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+        }
+
+
+def query_shape(query, with_limits, with_col_aliases):
+    """
+    A hashable key for everything about `query` the SQL text depends on,
+    leaving out the filter values. Raises Uncacheable for queries whose SQL
+    depends on more than that.
+    """
+    if (query.select_related or query.extra or query.extra_tables or query.aggregates or query.distinct or
+            query.group_by is not None or query.having.children or query.related_select_cols):
+        raise Uncacheable
+    for col in query.select:
+        if not isinstance(col, tuple):
+            raise Uncacheable
+    field_names, defer = query.deferred_loading
+    return (query.__class__, query.model, with_limits, with_col_aliases,
+            tuple(query.select), tuple(query.select_fields), query.default_cols,
+            tuple(query.tables), frozenset(query.alias_map.items()), frozenset(query.alias_refcount.items()),
+            frozenset(query.included_inherited_models.items()), frozenset(field_names), defer,
+            tuple(query.order_by), tuple(query.extra_order_by), query.default_ordering, query.standard_ordering,
+            query.low_mark, query.high_mark, query.select_for_update, query.select_for_update_nowait,
+            where_shape(query.where))
+
+
+def where_shape(node):
+    if type(node) is not WhereNode:
+        raise Uncacheable
+    shape = [node.connector, node.negated]
+    for child in node.children:
+        if not isinstance(child, tuple):
+            shape.append(where_shape(child))
+            continue
+        constraint, lookup_type, value_annotation, value = child
+        if type(constraint) is not Constraint or hasattr(value, 'as_sql') or hasattr(value, '_as_sql'):
+            raise Uncacheable
+        if isinstance(value, (list, tuple, set, frozenset)):
+            if not value:
+                raise Uncacheable
+            size = len(value)
+        else:
+            size = None
+        shape.append((constraint.alias, constraint.col, constraint.field, lookup_type, value_annotation, size))
+    return tuple(shape)
+
+
+def where_params(node, connection):
+    """
+    The parameters WhereNode.as_sql() would return for a node accepted by
+    where_shape(), without building the SQL.
+    """
+    params = []
+    for child in node.children:
+        if not isinstance(child, tuple):
+            params.extend(where_params(child, connection))
+            continue
+        constraint, lookup_type, value_annotation, value = child
+        if lookup_type != 'isnull':
+            params.extend(constraint.process(lookup_type, value, connection)[1])
+    return params
@@ -0,0 +1,129 @@
+"""
+Statement timeouts.
+
+'QUERY_TIMEOUT': <seconds> in the database settings bounds every statement
+run through the backend's cursors; query_timeout() overrides it for the
+statements run inside a with block. A watchdog thread calls cancel() on the
+cursor once the deadline has passed and the statement fails with
+QueryTimeout. The driver's own query timeout is left alone: pyodbc only
+applies Connection.timeout to cursors created afterwards.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from contextlib import contextmanager
+import atexit
+import heapq
+import itertools
+import threading
+import time
+
+from django.db import connections, utils
+
+class QueryTimeout(utils.DatabaseError):
+    "A statement ran longer than its timeout and was cancelled."
+
+
+@contextmanager
+def query_timeout(seconds, using='default'):
+    """
+    Run the statements in the block with a timeout of `seconds` (None for
+    no timeout) instead of the connection's QUERY_TIMEOUT.
+    """
+    connection = connections[using]
+    previous = connection.query_timeout
+    connection.query_timeout = seconds
+    try:
+        yield
+    finally:
+        connection.query_timeout = previous
+
+
+class Deadline(object):
+    __slots__ = ('when', 'cursor', 'done', 'fired')
+
+    def __init__(self, when, cursor):
+        self.when = when
+        self.cursor = cursor
+        self.done = False
+        self.fired = False
+
+
+class Watchdog(object):
+    """
+    One daemon thread cancelling the cursors whose deadline has passed.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.heap = []
+        self.counter = itertools.count()
+        self.thread = None
+        self.stopped = False
+
+    def arm(self, seconds, cursor):
+        deadline = Deadline(time.time() + seconds, cursor)
+        with self.condition:
+            heapq.heappush(self.heap, (deadline.when, next(self.counter), deadline))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='hana-query-timeout')
+                self.thread.daemon = True
+                self.thread.start()
+            self.condition.notify()
+        return deadline
+
+    def disarm(self, deadline):
+        # Taking the lock waits for a cancel() of this deadline in progress,
+        # so none can reach the cursor once its statement has returned.
+        with self.condition:
+            deadline.done = True
+
+    def stop(self):
+        """
+        End the thread. Run at exit, as a daemon thread woken up during the
+        interpreter's teardown fails on the modules already cleared.
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(1)
+
+    def run(self):
+        while not self.stopped:
+            with self.condition:
+                while self.heap and self.heap[0][2].done:
+                    heapq.heappop(self.heap)
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+                wait = self.heap[0][0] - time.time()
+                if wait > 0:
+                    self.condition.wait(wait)
+                    continue
+                deadline = heapq.heappop(self.heap)[2]
+                if deadline.done:
+                    continue
+                deadline.fired = True
+                try:
+                    deadline.cursor.cancel()
+                except Exception:
+                    pass
+
+
+watchdog = Watchdog()
+atexit.register(watchdog.stop)
+
+
+@contextmanager
+def statement_timeout(connection, cursor, seconds):
+    """
+    Enforce `seconds` on the statement executed in the block, turning the
+    error of a statement cancelled by the watchdog into QueryTimeout.
+    """
+    deadline = watchdog.arm(seconds, cursor)
+    try:
+        yield
+    except Exception as error:
+        if deadline.fired:
+            raise QueryTimeout('Statement cancelled after exceeding its %ss timeout: %s' % (seconds, error))
+        raise
+    finally:
+        watchdog.disarm(deadline)
@@ -0,0 +1,54 @@
+"""
+Tests for the django_hana_odbc backend.
+
+Like the benchmarks, they run against the in-process pyodbc stand-in
+(benchmarks/fake_pyodbc.py), so no HANA instance is needed. From the
+repository root:
+
+    python -m unittest discover -s tests -t .
+"""
+import sys
+
+from benchmarks import fake_pyodbc
+
+sys.modules['pyodbc'] = fake_pyodbc
+
+from django.conf import settings
+
+if not settings.configured:
+    database = {
+        'ENGINE': 'django_hana_odbc',
+        'NAME': 'test',
+        'DSN': 'test',
+        'USER': 'test',
+        'PASSWORD': 'test',
+        'DEFER_LOBS': True,
+        'IN_LIST_THRESHOLD': 5,
+    }
+    settings.configure(
+        DATABASES={'default': database, 'nocache': dict(database, SQL_CACHE=False)},
+        INSTALLED_APPS=['tests'],
+        USE_TZ=False,
+        DEBUG=False,
+    )
+
+import unittest
+
+from django.db import connections
+
+
+def compile_sql(queryset, using='default'):
+    return queryset.query.get_compiler(using).as_sql()
+
+
+def executed(using='default'):
+    "The SQL of the statements run on `using` so far."
+    return [sql for method, sql, params in connections[using].connection.calls if method == 'execute']
+
+
+class BackendTestCase(unittest.TestCase):
+    def setUp(self):
+        for using in ('default', 'nocache'):
+            connections[using].cursor()
+            connections[using].connection.calls.clear()
+        fake_pyodbc.set_rows([])
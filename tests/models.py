@@ -0,0 +1,71 @@
+from django.db import models
+from django_hana_odbc import case_insensitive, fulltext_index
+from django_hana_odbc.lobs import DeferLobsManager
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=64)
+
+    class Meta:
+        app_label = 'tests'
+        ordering = ('name',)
+
+
+class Book(models.Model):
+    author = models.ForeignKey(Author)
+    title = models.CharField(max_length=128)
+    body = models.TextField()
+
+    objects = DeferLobsManager()
+
+    class Meta:
+        app_label = 'tests'
+
+
+class Place(models.Model):
+    name = models.CharField(max_length=64)
+
+    class Meta:
+        app_label = 'tests'
+
+
+class Restaurant(Place):
+    serves_pizza = models.BooleanField(default=False)
+
+    class Meta:
+        app_label = 'tests'
+
+
+@case_insensitive('username')
+class Account(models.Model):
+    username = models.CharField(max_length=64)
+    email = models.CharField(max_length=128)
+
+    class Meta:
+        app_label = 'tests'
+
+
+@fulltext_index('body')
+class Article(models.Model):
+    title = models.CharField(max_length=128)
+    body = models.TextField()
+
+    class Meta:
+        app_label = 'tests'
+
+
+class Event(models.Model):
+    name = models.CharField(max_length=64)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    at = models.DateTimeField()
+    day = models.DateField()
+
+    class Meta:
+        app_label = 'tests'
+
+
+class Profile(models.Model):
+    author = models.OneToOneField(Author, primary_key=True)
+
+    class Meta:
+        app_label = 'tests'
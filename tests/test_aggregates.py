@@ -0,0 +1,40 @@
+from __future__ import absolute_import, unicode_literals
+from benchmarks import fake_pyodbc
+from django.db.models import StdDev, Variance
+from django_hana_odbc.aggregates import Median, Percentile
+from tests import BackendTestCase, executed
+from tests.models import Event
+
+
+class AggregatesTest(BackendTestCase):
+    def test_median(self):
+        fake_pyodbc.set_rows([(2,)])
+        self.assertEqual(Event.objects.aggregate(Median('amount')), {'amount__median': 2.0})
+        self.assertIn('MEDIAN("TESTS_EVENT"."AMOUNT")', executed()[-1])
+
+    def test_percentile(self):
+        fake_pyodbc.set_rows([(3, 3)])
+        result = Event.objects.aggregate(p95=Percentile('amount', 0.95), p50=Percentile('amount', '0.5', discrete=True))
+        # Only the interpolated percentile is converted to a float
+        self.assertIsInstance(result['p95'], float)
+        self.assertIsInstance(result['p50'], int)
+        sql = executed()[-1]
+        self.assertIn('PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY "TESTS_EVENT"."AMOUNT")', sql)
+        self.assertIn('PERCENTILE_DISC(0.5) WITHIN GROUP (ORDER BY "TESTS_EVENT"."AMOUNT")', sql)
+
+    def test_percentile_range(self):
+        self.assertRaises(ValueError, Event.objects.aggregate, Percentile('amount', 1.5))
+        self.assertRaises(ValueError, Event.objects.aggregate, Percentile('amount', -0.1))
+
+    def test_population_variants(self):
+        fake_pyodbc.set_rows([(1, 2)])
+        Event.objects.aggregate(StdDev('amount', sample=False), Variance('amount', sample=False))
+        sql = executed()[-1]
+        self.assertIn('STDDEV_POP("TESTS_EVENT"."AMOUNT")', sql)
+        self.assertIn('VAR_POP("TESTS_EVENT"."AMOUNT")', sql)
+
+    def test_annotate(self):
+        fake_pyodbc.set_rows([('a', 2)])
+        values = list(Event.objects.values('name').annotate(median=Median('amount')))
+        self.assertEqual(values, [{'name': 'a', 'median': 2.0}])
+        self.assertIn('GROUP BY "TESTS_EVENT"."NAME"', executed()[-1])
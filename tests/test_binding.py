@@ -0,0 +1,70 @@
+from __future__ import absolute_import, unicode_literals
+import datetime
+import decimal
+
+from benchmarks import fake_pyodbc
+from django.db import connections
+from tests import BackendTestCase
+from tests.models import Event
+
+AT = datetime.datetime(2013, 1, 2, 3, 4, 5)
+
+
+class NativeBindingTest(BackendTestCase):
+    def calls(self):
+        return list(connections['default'].connection.calls)
+
+    def test_filter_params(self):
+        list(Event.objects.filter(at__gte=AT, day=AT.date()).filter(amount=decimal.Decimal('2.5')))
+        self.assertEqual(self.calls()[-1][2], (AT, AT.date(), decimal.Decimal('2.50')))
+
+    def test_year_lookup(self):
+        list(Event.objects.filter(at__year=2013))
+        self.assertEqual(self.calls()[-1][2], (datetime.datetime(2013, 1, 1),
+                                               datetime.datetime(2013, 12, 31, 23, 59, 59, 999999)))
+
+    def test_operations(self):
+        ops = connections['default'].ops
+        self.assertEqual(ops.value_to_db_decimal(decimal.Decimal('1.25'), 5, 1), decimal.Decimal('1.2'))
+        self.assertIsInstance(ops.value_to_db_decimal(decimal.Decimal('1.25'), 5, 1), decimal.Decimal)
+        self.assertIs(ops.value_to_db_datetime(AT), AT)
+        self.assertRaises(ValueError, ops.value_to_db_time, datetime.time(1, tzinfo=FixedOffset()))
+
+    def test_bulk_create_declares_input_sizes(self):
+        events = [Event(name='a', amount=decimal.Decimal('1.25'), at=AT, day=AT.date()) for i in range(3)]
+        Event.objects.bulk_create(events)
+        calls = self.calls()
+        self.assertEqual(calls[0], ('setinputsizes', None, [None, None, (fake_pyodbc.SQL_TYPE_TIMESTAMP, 27, 7),
+                                                            (fake_pyodbc.SQL_TYPE_DATE, 10, 0)]))
+        self.assertEqual(calls[1][0], 'executemany')
+        self.assertEqual(len(calls[1][2]), 3)
+        self.assertEqual(calls[1][2][0], ('a', decimal.Decimal('1.25'), AT, AT.date()))
+        self.assertEqual(calls[2], ('setinputsizes', None, None))
+
+    def test_input_sizes_cached(self):
+        connection = connections['default']
+        Event.objects.bulk_create([Event(name='a', amount=1, at=AT, day=AT.date())])
+        cached = len(connection.input_sizes)
+        Event.objects.bulk_create([Event(name='b', amount=2, at=AT, day=AT.date())])
+        self.assertEqual(len(connection.input_sizes), cached)
+
+    def test_no_input_sizes_for_plain_values(self):
+        connections['default'].cursor().executemany('INSERT INTO T VALUES (%s)', [('a',), ('b',)])
+        self.assertEqual([call[0] for call in self.calls()], ['executemany'])
+
+    def test_fast_executemany(self):
+        settings_dict = connections['default'].settings_dict
+        settings_dict['FAST_EXECUTEMANY'] = True
+        try:
+            cursor = connections['default'].cursor()
+        finally:
+            del settings_dict['FAST_EXECUTEMANY']
+        self.assertTrue(cursor.cursor.fast_executemany)
+
+
+class FixedOffset(datetime.tzinfo):
+    def utcoffset(self, dt):
+        return datetime.timedelta(hours=1)
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
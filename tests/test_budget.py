@@ -0,0 +1,86 @@
+from __future__ import absolute_import, unicode_literals
+import logging
+
+from django.http import HttpResponse
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from django_hana_odbc import budget
+from django_hana_odbc.budget import QueryBudget, QueryBudgetExceeded, QueryBudgetMiddleware
+from tests import BackendTestCase
+from tests.models import Author
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class QueryBudgetTest(BackendTestCase):
+    def setUp(self):
+        super(QueryBudgetTest, self).setUp()
+        self.handler = RecordingHandler()
+        budget.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        budget.logger.removeHandler(self.handler)
+        super(QueryBudgetTest, self).tearDown()
+
+    def test_fingerprint(self):
+        self.assertEqual(budget.fingerprint("SELECT * FROM T WHERE A = 'x''y' AND B IN (?, ?, ?) AND C > 10"),
+                         'SELECT * FROM T WHERE A = ? AND B IN (...) AND C > ?')
+
+    def test_repeats_logged(self):
+        with QueryBudget(max_queries=5, max_repeats=3, name='loop') as outer:
+            with QueryBudget() as inner:
+                for i in range(3):
+                    list(Author.objects.filter(pk=i))
+            list(Author.objects.all())
+        self.assertEqual(inner.queries, 3)
+        self.assertEqual(outer.queries, 4)
+        self.assertEqual(len(outer.repeated()), 1)
+        self.assertEqual(len(self.handler.messages), 1)
+        self.assertIn('loop: possible N+1, 3 times', self.handler.messages[0])
+        self.assertIsNone(budget.current())
+
+    def test_strict(self):
+        def run():
+            with QueryBudget(max_queries=2, strict=True):
+                for i in range(5):
+                    list(Author.objects.all())
+        self.assertRaises(QueryBudgetExceeded, run)
+        self.assertIsNone(budget.current())
+
+
+class QueryBudgetMiddlewareTest(BackendTestCase):
+    def setUp(self):
+        super(QueryBudgetMiddlewareTest, self).setUp()
+        self.request = RequestFactory().get('/authors/')
+
+    def test_strict(self):
+        with override_settings(HANA_QUERY_BUDGET={'MAX_QUERIES': 1, 'STRICT': True}):
+            middleware = QueryBudgetMiddleware()
+        middleware.process_request(self.request)
+        list(Author.objects.all())
+        try:
+            list(Author.objects.all())
+        except QueryBudgetExceeded as e:
+            self.assertIn('GET /authors/: 2 queries, budget 1', str(e))
+            middleware.process_exception(self.request, e)
+        else:
+            self.fail('QueryBudgetExceeded not raised')
+        self.assertIsNone(budget.current())
+
+    def test_not_strict(self):
+        with override_settings(HANA_QUERY_BUDGET={'MAX_QUERIES': 1}):
+            middleware = QueryBudgetMiddleware()
+        middleware.process_request(self.request)
+        for i in range(3):
+            list(Author.objects.all())
+        response = HttpResponse()
+        self.assertIs(middleware.process_response(self.request, response), response)
+        self.assertEqual(self.request.query_budget.queries, 3)
+        self.assertIsNone(budget.current())
@@ -0,0 +1,36 @@
+from __future__ import absolute_import, unicode_literals
+from django.core.management.color import no_style
+from django.db import connections
+from tests import BackendTestCase, compile_sql, executed
+from tests.models import Account
+
+
+class CaseInsensitiveTest(BackendTestCase):
+    def test_generated_column(self):
+        creation = connections['default'].creation
+        sql = creation.sql_create_model(Account, no_style())[0][0]
+        self.assertIn('"USERNAME_UPPER" nvarchar(64) GENERATED ALWAYS AS UPPER("USERNAME")', sql)
+        self.assertNotIn('EMAIL_UPPER', sql)
+        indexes = creation.sql_indexes_for_field(Account, Account._meta.get_field('username'), no_style())
+        self.assertEqual(len(indexes), 1)
+        self.assertIn('("USERNAME_UPPER")', indexes[0])
+
+    def test_lookup_uses_upper_column(self):
+        sql, params = compile_sql(Account.objects.filter(username__iexact='Ab').filter(email__iexact='x'))
+        self.assertIn('"TESTS_ACCOUNT"."USERNAME_UPPER" = %s', sql)
+        self.assertIn('UPPER("TESTS_ACCOUNT"."EMAIL") = UPPER(%s)', sql)
+        self.assertEqual(params, ('AB', 'x'))
+
+    def test_pattern_lookups(self):
+        sql, params = compile_sql(Account.objects.filter(username__istartswith='ab'))
+        self.assertIn('"TESTS_ACCOUNT"."USERNAME_UPPER" LIKE %s', sql)
+        self.assertEqual(params, ('AB%',))
+
+    def test_queryset_not_rewritten(self):
+        queryset = Account.objects.filter(username__iexact='ab')
+        compile_sql(queryset)
+        self.assertEqual(queryset.query.where.children[0].children[0][1], 'iexact')
+
+    def test_delete(self):
+        Account.objects.filter(username__iexact='zz').delete()
+        self.assertIn('"USERNAME_UPPER" = ?', executed()[-1])
@@ -0,0 +1,43 @@
+from __future__ import absolute_import, unicode_literals
+from benchmarks import fake_pyodbc
+from django.db import connections
+from django.db.models import signals
+from tests import BackendTestCase
+from tests.models import Author, Book
+
+
+class BuildSchemaTest(BackendTestCase):
+    def setUp(self):
+        super(BuildSchemaTest, self).setUp()
+        self.creation = connections['default'].creation
+        self.steps = []
+        # Record the statements instead of running them on worker threads
+        self.creation._execute_concurrently = lambda tasks, workers: self.steps.append(('execute', tasks))
+        signals.post_syncdb.connect(self.post_syncdb)
+
+    def tearDown(self):
+        signals.post_syncdb.disconnect(self.post_syncdb)
+        del self.creation._execute_concurrently
+        super(BuildSchemaTest, self).tearDown()
+
+    def post_syncdb(self, sender, created_models, **kwargs):
+        if sender.__name__ == 'tests.models':
+            self.steps.append(('post_syncdb', created_models))
+
+    def test_order(self):
+        self.creation.build_schema([Author, Book], load_data=lambda: self.steps.append(('load_data', None)),
+                                   verbosity=0)
+        self.assertEqual([step for step, value in self.steps], ['execute', 'post_syncdb', 'load_data', 'execute'])
+        tables, indexes = self.steps[0][1], self.steps[3][1]
+        self.assertEqual(len(tables), 2)
+        self.assertTrue(tables[0][0].startswith('CREATE COLUMN TABLE "TESTS_AUTHOR"'))
+        self.assertIn('CREATE SEQUENCE', tables[0][1])
+        self.assertEqual(self.steps[1][1], set([Author, Book]))
+        self.assertEqual(len(indexes), 1)
+        self.assertIn('("AUTHOR_ID")', indexes[0][0])
+
+    def test_existing_tables_skipped(self):
+        fake_pyodbc.set_rows([('TESTS_AUTHOR',)])
+        self.creation.build_schema([Author, Book], verbosity=0)
+        self.assertEqual(self.steps[1][1], set([Book]))
+        self.assertEqual([sql[0].split(' (')[0] for sql in self.steps[0][1]], ['CREATE COLUMN TABLE "TESTS_BOOK"'])
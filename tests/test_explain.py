@@ -0,0 +1,62 @@
+from __future__ import absolute_import, unicode_literals
+from benchmarks import fake_pyodbc
+from django.db import connections
+from django_hana_odbc import explain
+from tests import BackendTestCase, executed
+from tests.models import Book
+
+
+class ExplainCaptureTest(BackendTestCase):
+    def setUp(self):
+        super(ExplainCaptureTest, self).setUp()
+        self.connection = connections['default']
+        self.settings_dict = dict(self.connection.settings_dict)
+        # Pretend the worker runs so that captured queries stay queued
+        self.worker = explain._worker[:]
+        explain._worker[:] = [None]
+        explain._last_capture.clear()
+
+    def tearDown(self):
+        self.connection.settings_dict.clear()
+        self.connection.settings_dict.update(self.settings_dict)
+        explain._worker[:] = self.worker
+        explain._last_capture.clear()
+        while not explain._queue.empty():
+            explain._queue.get_nowait()
+        super(ExplainCaptureTest, self).tearDown()
+
+    def captured(self):
+        return explain._queue.qsize()
+
+    def test_capture(self):
+        explain.capture(self.connection, 'SELECT 1 FROM DUMMY', (), 2.5)
+        query = explain._queue.get_nowait()
+        self.assertEqual((query.alias, query.sql, query.duration), ('default', 'SELECT 1 FROM DUMMY', 2.5))
+
+    def test_sample_rate(self):
+        self.connection.settings_dict['EXPLAIN_SAMPLE_RATE'] = 0.0
+        explain.capture(self.connection, 'SELECT 1 FROM DUMMY', (), 2.5)
+        self.assertEqual(self.captured(), 0)
+        self.assertEqual(explain._last_capture, {})
+
+    def test_interval(self):
+        self.connection.settings_dict['EXPLAIN_INTERVAL'] = 60
+        explain.capture(self.connection, 'SELECT 1 FROM DUMMY', (), 2.5)
+        explain.capture(self.connection, 'SELECT 2 FROM DUMMY', (), 2.5)
+        self.assertEqual(self.captured(), 1)
+        # The limit is per alias
+        explain.capture(connections['nocache'], 'SELECT 2 FROM DUMMY', (), 2.5)
+        self.assertEqual(self.captured(), 2)
+        self.connection.settings_dict['EXPLAIN_INTERVAL'] = 0
+        explain.capture(self.connection, 'SELECT 3 FROM DUMMY', (), 2.5)
+        self.assertEqual(self.captured(), 3)
+
+    def test_queryset_explain(self):
+        fake_pyodbc.set_rows([tuple(range(len(explain.PLAN_COLUMNS)))])
+        plan = explain.queryset_explain(Book.objects.filter(title='a'))
+        self.assertEqual(plan[0]['OPERATOR_ID'], 0)
+        self.assertEqual(plan[0]['SUBTREE_COST'], len(explain.PLAN_COLUMNS) - 1)
+        sql = executed()
+        self.assertTrue(sql[0].startswith("EXPLAIN PLAN SET STATEMENT_NAME = 'django_"))
+        self.assertIn('"TESTS_BOOK"."TITLE" = ?', sql[0])
+        self.assertTrue(sql[-1].startswith('DELETE FROM EXPLAIN_PLAN_TABLE'))
@@ -0,0 +1,30 @@
+from __future__ import absolute_import, unicode_literals
+from django.core.management.color import no_style
+from django.db import connections
+from tests import BackendTestCase, compile_sql
+from tests.models import Article
+
+
+class FulltextTest(BackendTestCase):
+    def test_index(self):
+        creation = connections['default'].creation
+        indexes = creation.sql_indexes_for_field(Article, Article._meta.get_field('body'), no_style())
+        self.assertEqual(len(indexes), 1)
+        self.assertTrue(indexes[0].startswith('CREATE FULLTEXT INDEX "TESTS_ARTICLE_'))
+        self.assertTrue(indexes[0].endswith('ON "TESTS_ARTICLE" ("BODY") ASYNC'))
+        self.assertEqual(creation.sql_indexes_for_field(Article, Article._meta.get_field('title'), no_style()), [])
+
+    def test_search(self):
+        sql, params = compile_sql(Article.objects.filter(body__search='hana'))
+        self.assertIn('CONTAINS("TESTS_ARTICLE"."BODY", %s, FUZZY(0.8))', sql)
+        self.assertEqual(params, ('hana',))
+
+    def test_exact_search(self):
+        # on the connection without SQL cache, as the setting isn't part of the cache key
+        settings_dict = connections['nocache'].settings_dict
+        settings_dict['FULLTEXT_FUZZY_SCORE'] = None
+        try:
+            sql, params = compile_sql(Article.objects.filter(body__search='hana'), 'nocache')
+        finally:
+            del settings_dict['FULLTEXT_FUZZY_SCORE']
+        self.assertIn('CONTAINS("TESTS_ARTICLE"."BODY", %s, EXACT)', sql)
@@ -0,0 +1,28 @@
+from __future__ import absolute_import, unicode_literals
+from django.db import connections
+from django_hana_odbc.compiler import InListValues
+from tests import BackendTestCase, compile_sql, executed
+from tests.models import Book
+
+
+class InListTest(BackendTestCase):
+    def test_compile_has_no_side_effects(self):
+        queryset = Book.objects.filter(pk__in=range(10))
+        where = repr(queryset.query.where)
+        sql, params = compile_sql(queryset, 'default')
+        self.assertIn('"#DJANGO_IN_INT"', sql)
+        self.assertIsInstance(params[0], InListValues)
+        self.assertEqual(executed(), [])
+        self.assertEqual(repr(queryset.query.where), where)
+
+    def test_values_loaded_on_execute(self):
+        list(Book.objects.filter(pk__in=range(10)))
+        calls = list(connections['default'].connection.calls)
+        self.assertEqual(calls[-2][0], 'executemany')
+        slot = calls[-2][2][0][0]
+        self.assertEqual(calls[-1][2], (slot,))
+
+    def test_short_list_inline(self):
+        sql, params = compile_sql(Book.objects.filter(pk__in=[1, 2]))
+        self.assertIn('IN (%s, %s)', sql)
+        self.assertEqual(params, (1, 2))
@@ -0,0 +1,46 @@
+from __future__ import absolute_import, unicode_literals
+from benchmarks import fake_pyodbc
+from django.db import connections
+from django_hana_odbc.lobs import iter_lob, write_lob
+from tests import BackendTestCase, executed
+from tests.models import Book
+
+
+class DeferLobsTest(BackendTestCase):
+    def test_lobs_deferred(self):
+        list(Book.objects.filter(title='a'))
+        list(Book.objects.using('nocache').filter(title='a'))
+        self.assertEqual(executed('default'), executed('nocache'))
+        self.assertNotIn('"BODY"', executed()[-1])
+
+    def test_only_loads_lob(self):
+        list(Book.objects.only('title', 'body'))
+        self.assertIn('"BODY"', executed()[-1])
+
+    def test_lob_loaded_on_access(self):
+        fake_pyodbc.set_rows([(1, 2, 'title')])
+        book = list(Book.objects.all())[0]
+        fake_pyodbc.set_rows([(1, 'body')])
+        self.assertEqual(book.body, 'body')
+        self.assertIsInstance(book.body, type(''))
+
+
+class ChunkedLobTest(BackendTestCase):
+    def calls(self):
+        return [(sql, params) for method, sql, params in connections['default'].connection.calls]
+
+    def test_write_lob(self):
+        write_lob(Book, 1, 'body', ['ab', 'cd'])
+        self.assertEqual(self.calls(), [
+            ('UPDATE "TESTS_BOOK" SET "BODY" = ? WHERE "ID" = ?', ('ab', 1)),
+            ('UPDATE "TESTS_BOOK" SET "BODY" = "BODY" || ? WHERE "ID" = ?', ('cd', 1)),
+        ])
+
+    def test_write_lob_without_chunks(self):
+        write_lob(Book, 1, 'body', iter([]))
+        self.assertEqual(self.calls(), [('UPDATE "TESTS_BOOK" SET "BODY" = ? WHERE "ID" = ?', ('', 1))])
+
+    def test_iter_lob(self):
+        fake_pyodbc.set_rows([('ab',)])
+        self.assertEqual(list(iter_lob(Book, 1, 'body', chunk_size=4)), ['ab'])
+        self.assertEqual(self.calls(), [('SELECT SUBSTRING("BODY", ?, ?) FROM "TESTS_BOOK" WHERE "ID" = ?', (1, 4, 1))])
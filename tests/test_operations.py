@@ -0,0 +1,27 @@
+from __future__ import absolute_import, unicode_literals
+from django.db import connections
+from tests import BackendTestCase, executed
+from tests.models import Event
+
+
+class DateTruncTest(BackendTestCase):
+    def setUp(self):
+        super(DateTruncTest, self).setUp()
+        self.ops = connections['default'].ops
+
+    def test_series_round(self):
+        self.assertEqual(self.ops.date_trunc_sql('month', '"AT"'), "SERIES_ROUND(\"AT\", 'INTERVAL 1 MONTH', ROUND_DOWN)")
+        self.assertEqual(self.ops.date_trunc_sql('quarter', '"AT"'),
+                         "SERIES_ROUND(\"AT\", 'INTERVAL 3 MONTH', ROUND_DOWN)")
+
+    def test_week_starts_on_monday(self):
+        self.assertEqual(self.ops.date_trunc_sql('week', '"AT"'),
+                         "SERIES_ROUND(\"AT\", 'INTERVAL 7 DAY', ROUND_DOWN, '1900-01-01')")
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, self.ops.date_trunc_sql, 'second', '"AT"')
+        self.assertRaises(ValueError, self.ops.date_trunc_sql, 'YEAR', '"AT"')
+
+    def test_dates(self):
+        list(Event.objects.dates('at', 'year'))
+        self.assertIn("SERIES_ROUND(\"TESTS_EVENT\".\"AT\", 'INTERVAL 1 YEAR', ROUND_DOWN)", executed()[-1])
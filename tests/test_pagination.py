@@ -0,0 +1,50 @@
+from __future__ import absolute_import, unicode_literals
+from benchmarks import fake_pyodbc
+from django.core.exceptions import FieldError
+from django_hana_odbc.pagination import keyset_page
+from tests import BackendTestCase, executed
+from tests.models import Author, Book, Profile, Restaurant
+
+
+class KeysetPageTest(BackendTestCase):
+    def test_reversed(self):
+        keyset_page(Book.objects.order_by('title').reverse(), after=('t', 3))
+        sql = executed()[-1]
+        self.assertIn('"TESTS_BOOK"."TITLE" <= ?', sql)
+        self.assertIn('"TESTS_BOOK"."TITLE" < ?', sql)
+        self.assertIn('ORDER BY "TESTS_BOOK"."TITLE" DESC, "TESTS_BOOK"."ID" DESC', sql)
+
+    def test_foreign_key(self):
+        fake_pyodbc.set_rows([(1, 7, 'a'), (2, 8, 'b')])
+        page = keyset_page(Book.objects.order_by('author'), per_page=1)
+        self.assertEqual(page.next_key, (7, 1))
+        self.assertEqual(len(executed()), 1)
+        keyset_page(Book.objects.order_by('author'), after=page.next_key)
+        self.assertIn('"TESTS_BOOK"."AUTHOR_ID" > ?', executed()[-1])
+
+    def test_leading_range(self):
+        keyset_page(Book.objects.order_by('-title'), after=('t', 3))
+        self.assertIn('("TESTS_BOOK"."TITLE" <= ?  AND (', executed()[-1])
+        keyset_page(Book.objects.order_by('pk'), after=(3,))
+        self.assertIn('"TESTS_BOOK"."ID" > ?', executed()[-1])
+        self.assertNotIn('>=', executed()[-1])
+
+    def test_inherited_pk(self):
+        fake_pyodbc.set_rows([(1, 'a', 1, True), (2, 'b', 2, False)])
+        for ordering, direction in (('pk', 'ASC'), ('-pk', 'DESC')):
+            page = keyset_page(Restaurant.objects.order_by(ordering), per_page=1)
+            self.assertEqual(page.next_key, (1,))
+            self.assertIn('ORDER BY "TESTS_RESTAURANT"."PLACE_PTR_ID" %s LIMIT 2' % direction, executed()[-1])
+
+    def test_relation_pk(self):
+        # ordering by a one-to-one primary key would sort by Author's Meta.ordering
+        fake_pyodbc.set_rows([(4,), (5,)])
+        page = keyset_page(Profile.objects.order_by('pk'), per_page=1)
+        self.assertEqual(page.next_key, (4,))
+        keyset_page(Profile.objects.all(), after=page.next_key)
+        sql = executed()[-1]
+        self.assertIn('"TESTS_PROFILE"."AUTHOR_ID" > ?', sql)
+        self.assertIn('ORDER BY "TESTS_PROFILE"."AUTHOR_ID" ASC', sql)
+
+    def test_multi_valued_relation(self):
+        self.assertRaises(FieldError, keyset_page, Author.objects.order_by('book'))
@@ -0,0 +1,28 @@
+from __future__ import absolute_import, unicode_literals
+from benchmarks import fake_pyodbc
+from django.db.models import Count
+from django_hana_odbc.rows import iter_values
+from tests import BackendTestCase
+from tests.models import Book, Restaurant
+
+
+class IterValuesTest(BackendTestCase):
+    def test_distinct_order_by(self):
+        fake_pyodbc.set_rows([('a', 'z')])
+        queryset = Book.objects.values_list('title').distinct().order_by('author__name')
+        self.assertEqual(list(iter_values(queryset)), [('a',)])
+        self.assertEqual(list(iter_values(queryset)), list(queryset))
+
+
+class ResolveColumnsTest(BackendTestCase):
+    def test_boolean(self):
+        fake_pyodbc.set_rows([(1, 'a', 1, 1), (2, 'b', 2, 0)])
+        self.assertEqual([r.serves_pizza for r in Restaurant.objects.all()], [True, False])
+
+    def test_annotate_values(self):
+        fake_pyodbc.set_rows([(3,)])
+        self.assertEqual(list(Restaurant.objects.annotate(n=Count('pk')).values('n')), [{'n': 3}])
+
+    def test_extra_values(self):
+        fake_pyodbc.set_rows([(3,)])
+        self.assertEqual(list(Restaurant.objects.extra(select={'x': '1'}).values_list('x', flat=True)), [3])
@@ -0,0 +1,44 @@
+from __future__ import absolute_import, unicode_literals
+from django.db import connections
+from django.db.models import Q
+from tests import BackendTestCase, compile_sql
+from tests.models import Author, Book, Place, Restaurant
+
+
+class SQLCacheTest(BackendTestCase):
+    """
+    A cached compile must produce what compiling without the cache does.
+    """
+    def assertCacheMatches(self, build, *values):
+        cache = connections['default'].sql_cache
+        hits = cache.hits
+        for value in values:
+            self.assertEqual(compile_sql(build(value), 'default'), compile_sql(build(value), 'nocache'))
+        self.assertGreater(cache.hits, hits)
+
+    def test_filter(self):
+        self.assertCacheMatches(lambda v: Author.objects.filter(name=v), 'a', 'b')
+
+    def test_join(self):
+        self.assertCacheMatches(lambda v: Book.objects.filter(author__name=v), 'a', 'b')
+        self.assertCacheMatches(lambda v: Author.objects.filter(book__title__startswith=v), 'a', 'b')
+
+    def test_inheritance(self):
+        self.assertCacheMatches(lambda v: Restaurant.objects.filter(name=v, serves_pizza=True), 'a', 'b')
+        self.assertCacheMatches(lambda v: Place.objects.filter(restaurant__serves_pizza=True, name=v), 'a', 'b')
+
+    def test_exclude_and_q(self):
+        self.assertCacheMatches(lambda v: Book.objects.exclude(Q(title=v) | Q(author__name__startswith=v)),
+                                'a', 'b')
+        self.assertCacheMatches(lambda v: Book.objects.filter(~Q(title=v), Q(pk__gt=1) | Q(pk__lt=0)), 'a', 'b')
+
+    def test_in_size_change(self):
+        self.assertCacheMatches(lambda v: Book.objects.filter(pk__in=v), [1, 2], [3, 4], [1, 2, 3], [4, 5, 6], [7])
+
+    def test_slice(self):
+        self.assertCacheMatches(lambda v: Book.objects.filter(title=v)[:2], 'a', 'b')
+        self.assertCacheMatches(lambda v: Book.objects.filter(title=v)[3:5], 'a', 'b')
+
+    def test_deferred(self):
+        self.assertCacheMatches(lambda v: Book.objects.filter(title=v).defer('body'), 'a', 'b')
+        self.assertCacheMatches(lambda v: Book.objects.filter(title=v).only('body'), 'a', 'b')
@@ -0,0 +1,44 @@
+from __future__ import absolute_import, unicode_literals
+import time
+
+from benchmarks import fake_pyodbc
+from django.db import connections
+from django_hana_odbc.timeout import QueryTimeout, Watchdog, query_timeout
+from tests import BackendTestCase
+from tests.models import Book
+
+
+class QueryTimeoutTest(BackendTestCase):
+    def tearDown(self):
+        fake_pyodbc.set_latency(0)
+        super(QueryTimeoutTest, self).tearDown()
+
+    def test_cancelled(self):
+        fake_pyodbc.set_latency(5)
+        start = time.time()
+        with query_timeout(0.05):
+            self.assertRaises(QueryTimeout, list, Book.objects.all())
+        self.assertLess(time.time() - start, 2)
+
+    def test_within_timeout(self):
+        fake_pyodbc.set_latency(0.01)
+        with query_timeout(1):
+            self.assertEqual(list(Book.objects.all()), [])
+
+    def test_override_restored(self):
+        connection = connections['default']
+        previous = connection.query_timeout
+        with query_timeout(3):
+            self.assertEqual(connection.query_timeout, 3)
+        self.assertEqual(connection.query_timeout, previous)
+
+    def test_expired_deadline_not_fired(self):
+        # A statement that returned in time is never cancelled later
+        watchdog = Watchdog()
+        cursor = fake_pyodbc.connect('').cursor()
+        deadline = watchdog.arm(0.01, cursor)
+        watchdog.disarm(deadline)
+        time.sleep(0.05)
+        self.assertFalse(deadline.fired)
+        watchdog.stop()
+        self.assertFalse(watchdog.thread.is_alive())